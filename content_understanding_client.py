@@ -1,26 +1,93 @@
+import asyncio
 import base64
 import json
 import logging
+import mmap
 import os
+import random
 import requests
+import shutil
+import threading
 import time
 
-from dataclasses import dataclass
+import aiohttp
+import orjson
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
 from requests.models import Response
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
+from azure.core.exceptions import ClientAuthenticationError
+from azure.core.pipeline.transport import AioHttpTransport
 from azure.identity import DefaultAzureCredential
 from azure.storage.blob import (
     BlobServiceClient,
     generate_container_sas,
-    ContainerSasPermissions
+    ContainerSasPermissions,
+    UserDelegationKey,
 )
 from azure.storage.blob.aio import ContainerClient
+from urllib.parse import urlsplit
+import urllib3.exceptions
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 
 POLL_TIMEOUT_SECONDS = 120
+MAX_CONCURRENT_UPLOADS = 32
+BASE64_READ_CHUNK_BYTES = 57 * 1024  # multiple of 3, encodes to whole 76-char base64 groups
+USER_DELEGATION_KEY_BUCKET_SECONDS = 30 * 60
+USER_DELEGATION_KEY_MAX_LIFETIME = timedelta(days=7)  # service limit, counted from the request
+
+# Shared by every SAS generation in the process, so repeated calls skip the AAD and
+# storage round trips for the credential, the blob service client and the delegation key.
+_sas_lock = threading.Lock()
+_sas_credential: Optional[DefaultAzureCredential] = None
+_sas_blob_service_clients: Dict[str, BlobServiceClient] = {}
+
+
+def _get_sas_blob_service_client(account_name: str) -> BlobServiceClient:
+    global _sas_credential
+    with _sas_lock:
+        blob_service_client = _sas_blob_service_clients.get(account_name)
+        if blob_service_client is None:
+            if _sas_credential is None:
+                _sas_credential = DefaultAzureCredential()
+            blob_service_client = BlobServiceClient(
+                account_url=f"https://{account_name}.blob.core.windows.net",
+                credential=_sas_credential,
+            )
+            _sas_blob_service_clients[account_name] = blob_service_client
+        return blob_service_client
+
+
+@lru_cache(maxsize=32)
+def _get_user_delegation_key(account_name: str, expiry_hours: int, time_bucket: int) -> UserDelegationKey:
+    """
+    Returns a user delegation key valid from the start of the time bucket until the end of the
+    bucket plus `expiry_hours`, so any SAS issued during the bucket with that expiry is covered.
+    """
+    key_start = datetime.fromtimestamp(time_bucket * USER_DELEGATION_KEY_BUCKET_SECONDS, tz=timezone.utc)
+    key_expiry = key_start + timedelta(seconds=USER_DELEGATION_KEY_BUCKET_SECONDS, hours=expiry_hours)
+    return _get_sas_blob_service_client(account_name).get_user_delegation_key(key_start, key_expiry)
+
+
+class _BearerTokenAuth(requests.auth.AuthBase):
+    """Sets a bearer token from the token provider on every request, so long-lived sessions stay authorized."""
+
+    def __init__(self, token_provider: Callable[[], str]):
+        self._token_provider = token_provider
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        request.headers["Authorization"] = f"Bearer {self._token_provider()}"
+        return request
 
 
 @dataclass
@@ -31,6 +98,14 @@ class ReferenceDocItem:
     result_file_path: Optional[str] = None
 
 
+@dataclass
+class ReferenceDocsClassification:
+    analyze_list: List[ReferenceDocItem] = field(default_factory=list)
+    upload_only_list: List[ReferenceDocItem] = field(default_factory=list)
+    analyze_error: Optional[Exception] = None
+    upload_only_error: Optional[Exception] = None
+
+
 class AzureContentUnderstandingClient:
 
     PREBUILT_DOCUMENT_ANALYZER_ID: str = "prebuilt-documentAnalyzer"
@@ -38,9 +113,14 @@ class AzureContentUnderstandingClient:
     LABEL_FILE_SUFFIX: str = ".labels.json"
     KNOWLEDGE_SOURCE_LIST_FILE_NAME: str = "sources.jsonl"
     SAS_EXPIRY_HOURS: int = 1
+    ANALYZE_CONCURRENCY: int = 8
+    # Stays below the HTTPAdapter pool_maxsize so classify threads never queue for a connection
+    CLASSIFY_WORKERS: int = 16
+    # Consecutive connection errors or 5xx responses a poll loop rides out before giving up
+    MAX_POLL_TRANSIENT_ERRORS: int = 5
 
     # https://learn.microsoft.com/en-us/azure/ai-services/content-understanding/service-limits#document-and-text
-    SUPPORTED_FILE_TYPES_DOCUMENT_TXT: List[str] = [
+    SUPPORTED_FILE_TYPES_DOCUMENT_TXT: FrozenSet[str] = frozenset({
         ".pdf",
         ".tiff",
         ".jpg",
@@ -57,9 +137,9 @@ class AzureContentUnderstandingClient:
         ".eml",
         ".msg",
         ".xml",
-    ]
+    })
 
-    SUPPORTED_FILE_TYPES_DOCUMENT: List[str] = [
+    SUPPORTED_FILE_TYPES_DOCUMENT: FrozenSet[str] = frozenset({
         ".pdf",
         ".tiff",
         ".jpg",
@@ -67,7 +147,7 @@ class AzureContentUnderstandingClient:
         ".png",
         ".bmp",
         ".heif",
-    ]  # Pro mode and Training for Standard mode only support document data
+    })  # Pro mode and Training for Standard mode only support document data
 
     def __init__(
         self,
@@ -87,21 +167,208 @@ class AzureContentUnderstandingClient:
             raise ValueError("Endpoint must be provided.")
 
         self._endpoint = endpoint.rstrip("/")
+        self._endpoint_netloc = urlsplit(self._endpoint).netloc
         self._api_version = api_version
+        # Invariant URL pieces, so building a request URL is a single short format.
+        self._analyzers_base = f"{self._endpoint}/contentunderstanding/analyzers"
+        self._classifiers_base = f"{self._endpoint}/contentunderstanding/classifiers"
+        self._api_version_qs = f"?api-version={self._api_version}"
+        self._classify_urls: Dict[str, str] = {}
         self._logger = logging.getLogger(__name__)
 
         token = token_provider() if token_provider else None
+        # AAD tokens expire after about an hour, so a token provider is asked again on every
+        # request (it caches and refreshes the token itself); a subscription key wins if both are given.
+        self._token_provider = None if subscription_key else token_provider
 
         self._headers = self._get_headers(subscription_key, token, x_ms_useragent)
+        # Built once and passed as-is; never mutate these per request.
+        self._headers_json = {**self._headers, "Content-Type": "application/json"}
+        self._headers_octet = {**self._headers, "Content-Type": "application/octet-stream"}
+
+        # One pooled, keep-alive session for every sync call so the TLS
+        # handshake is paid once per host instead of once per request.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            # POST is left out of the retried methods: replaying an analyze or classify
+            # request would start a duplicate operation. status=0 hands 429/5xx responses
+            # straight back, so the poll loops retry them against their own deadline instead
+            # of urllib3 sleeping out an uncapped Retry-After inside a single request.
+            max_retries=Retry(
+                total=5,
+                status=0,
+                backoff_factor=0.5,
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._adapter = adapter
+        self._session.headers.update(self._headers)
+        if self._token_provider is not None:
+            self._session.auth = _BearerTokenAuth(self._token_provider)
+        # Advertise every content coding urllib3 can decode here (br once brotli is installed),
+        # so large poll results come back compressed. aiohttp negotiates the same on its own.
+        self._session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.CLASSIFY_WORKERS, thread_name_prefix="content-understanding"
+        )
 
-    def _get_analyzer_url(self, endpoint: str, api_version: str, analyzer_id: str) -> str:
-        return f"{endpoint}/contentunderstanding/analyzers/{analyzer_id}?api-version={api_version}"  # noqa
-
-    def _get_analyzer_list_url(self, endpoint: str, api_version: str) -> str:
-        return f"{endpoint}/contentunderstanding/analyzers?api-version={api_version}"
+        # Async blob uploads share one aiohttp session and one ContainerClient per
+        # container URL. Both are created lazily because they bind to the running loop,
+        # and are rebuilt when a different loop uses the client (see _bind_to_running_loop).
+        self._aiohttp_session: Optional[aiohttp.ClientSession] = None
+        self._container_clients: Dict[str, ContainerClient] = {}
+        self._upload_semaphore: Optional[asyncio.Semaphore] = None
+        self._analyze_semaphore: Optional[asyncio.Semaphore] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_shutdown_guard: Optional[AsyncIterator[None]] = None
+
+        # Reference docs classifications keyed by folder, with the mtime of every directory walked.
+        self._reference_docs_cache: Dict[
+            str, Tuple[Dict[str, int], ReferenceDocsClassification]
+        ] = {}
+
+    def close(self) -> None:
+        """Waits for pending classify_file calls, then closes the HTTP session and its pooled connections."""
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Returns how many requests the sync session sent on new versus reused connections,
+        to confirm keep-alive holds across polls. A low reuse count means the service (or
+        something in between) is closing idle connections before the next poll.
+        Counts come from the live urllib3 pools, so hosts evicted from the pool manager drop out.
+        """
+        pools = self._adapter.poolmanager.pools
+        new = requests_sent = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                new += pool.num_connections
+                requests_sent += pool.num_requests
+        return {"new": new, "reused": max(requests_sent - new, 0)}
+
+    async def aclose(self) -> None:
+        """Closes the cached container clients, the shared aiohttp session and the sync session."""
+        await self._close_async_resources()
+        self._async_loop = None
+        self._loop_shutdown_guard = None
+        self.close()
+
+    async def _close_async_resources(self) -> None:
+        container_clients, self._container_clients = self._container_clients, {}
+        for container_client in container_clients.values():
+            await container_client.close()
+        session, self._aiohttp_session = self._aiohttp_session, None
+        if session is not None:
+            await session.close()
+
+    def _bind_to_running_loop(self) -> None:
+        """
+        Ties the cached async resources to the running event loop. The aiohttp session, the
+        container clients on it and the semaphores can't be used from another loop, so when
+        a different loop calls in (e.g. a second asyncio.run) they are dropped and rebuilt.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is loop:
+            return
+        self._aiohttp_session = None
+        self._container_clients = {}
+        self._upload_semaphore = None
+        self._analyze_semaphore = None
+        self._async_loop = loop
+        # asyncio.run (and any runner calling shutdown_asyncgens) finalizes pending async
+        # generators before closing the loop; this parked one closes the loop's resources then.
+        # The generator is registered with the loop as soon as __anext__ is called.
+        self._loop_shutdown_guard = self._close_at_loop_shutdown(loop)
+        asyncio.ensure_future(self._loop_shutdown_guard.__anext__())
+
+    async def _close_at_loop_shutdown(self, loop: asyncio.AbstractEventLoop) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            # Only close what still belongs to this loop; the client may have moved on to another one
+            if self._async_loop is loop:
+                self._async_loop = None
+                await self._close_async_resources()
+
+    def __enter__(self) -> "AzureContentUnderstandingClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "AzureContentUnderstandingClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    def _get_aiohttp_session(self) -> aiohttp.ClientSession:
+        self._bind_to_running_loop()
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            self._aiohttp_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=32,
+                    keepalive_timeout=60,
+                    enable_cleanup_closed=True,
+                    # Resolve the service and storage hosts once per 5 minutes, not per connection
+                    use_dns_cache=True,
+                    ttl_dns_cache=300,
+                )
+            )
+        return self._aiohttp_session
 
-    def _get_analyze_url(self, endpoint: str, api_version: str, analyzer_id: str) -> str:
-        return f"{endpoint}/contentunderstanding/analyzers/{analyzer_id}:analyze?api-version={api_version}"  # noqa
+    def _get_container_client(self, storage_container_sas_url: str) -> ContainerClient:
+        """
+        Returns the cached ContainerClient for the given SAS URL, creating it on first use
+        with a transport that borrows the shared aiohttp session.
+        """
+        self._bind_to_running_loop()
+        container_client = self._container_clients.get(storage_container_sas_url)
+        if container_client is None:
+            transport = AioHttpTransport(session=self._get_aiohttp_session(), session_owner=False)
+            container_client = ContainerClient.from_container_url(
+                storage_container_sas_url, transport=transport
+            )
+            self._container_clients[storage_container_sas_url] = container_client
+        return container_client
+
+    def _get_upload_semaphore(self) -> asyncio.Semaphore:
+        # Caps outstanding blob uploads across all fan-outs; bursts beyond ~30
+        # concurrent operations per client cause long latency spikes.
+        self._bind_to_running_loop()
+        if self._upload_semaphore is None:
+            self._upload_semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+        return self._upload_semaphore
+
+    def _get_analyze_semaphore(self) -> asyncio.Semaphore:
+        # Bounds concurrent async analyze operations to respect the subscription's throughput limits
+        self._bind_to_running_loop()
+        if self._analyze_semaphore is None:
+            self._analyze_semaphore = asyncio.Semaphore(self.ANALYZE_CONCURRENCY)
+        return self._analyze_semaphore
+
+    def _get_async_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """Returns the headers for an aiohttp request, with a current bearer token if one is used."""
+        if self._token_provider is None:
+            return headers
+        return {**headers, "Authorization": f"Bearer {self._token_provider()}"}
+
+    def _get_analyzer_url(self, analyzer_id: str) -> str:
+        return f"{self._analyzers_base}/{analyzer_id}{self._api_version_qs}"
+
+    def _get_analyzer_list_url(self) -> str:
+        return f"{self._analyzers_base}{self._api_version_qs}"
+
+    def _get_analyze_url(self, analyzer_id: str) -> str:
+        return f"{self._analyzers_base}/{analyzer_id}:analyze{self._api_version_qs}"
 
     def _get_training_data_config(
         self, storage_container_sas_url: str, storage_container_path_prefix: str
@@ -122,11 +389,16 @@ class AzureContentUnderstandingClient:
             "fileListPath": self.KNOWLEDGE_SOURCE_LIST_FILE_NAME,
         }]
 
-    def _get_classifier_url(self, endpoint: str, api_version: str, classifier_id: str) -> str:
-        return f"{endpoint}/contentunderstanding/classifiers/{classifier_id}?api-version={api_version}"
+    def _get_classifier_url(self, classifier_id: str) -> str:
+        return f"{self._classifiers_base}/{classifier_id}{self._api_version_qs}"
 
-    def _get_classify_url(self, endpoint: str, api_version: str, classifier_id: str) -> str:
-        return f"{endpoint}/contentunderstanding/classifiers/{classifier_id}:classify?api-version={api_version}"
+    def _get_classify_url(self, classifier_id: str) -> str:
+        # Classifying many files with one classifier builds the same URL for every file
+        url = self._classify_urls.get(classifier_id)
+        if url is None:
+            url = f"{self._classifiers_base}/{classifier_id}:classify{self._api_version_qs}"
+            self._classify_urls[classifier_id] = url
+        return url
 
     def _get_headers(
         self, subscription_key: str, api_token: str, x_ms_useragent: str
@@ -147,6 +419,11 @@ class AzureContentUnderstandingClient:
         headers["x-ms-useragent"] = x_ms_useragent
         return headers
     
+    @staticmethod
+    def _is_url(file_location: str) -> bool:
+        """Returns True if the location is an http(s) URL rather than a local path."""
+        return urlsplit(file_location).scheme in ("http", "https")
+
     @staticmethod
     def is_supported_doc_type_by_file_ext(file_ext: str, is_document: bool=False) -> bool:
         """
@@ -179,8 +456,15 @@ class AzureContentUnderstandingClient:
         """
         if not file_path.is_file():
             return False
-        file_ext = file_path.suffix.lower()
-        return AzureContentUnderstandingClient.is_supported_doc_type_by_file_ext(file_ext, is_document)
+        return AzureContentUnderstandingClient._is_supported_suffix(file_path, is_document)
+
+    @staticmethod
+    def _is_supported_suffix(file_path: Path, is_document: bool=False) -> bool:
+        """
+        Checks only the suffix of the given path, without touching the file system.
+        For callers that already know the path is a file.
+        """
+        return AzureContentUnderstandingClient.is_supported_doc_type_by_file_ext(file_path.suffix, is_document)
 
     @staticmethod
     def generate_temp_container_sas_url(
@@ -205,15 +489,31 @@ class AzureContentUnderstandingClient:
         """
         if permissions is None:
             permissions = ContainerSasPermissions(read=True, list=True)
-        expiry_duration = timedelta(hours=expiry_hours or AzureContentUnderstandingClient.SAS_EXPIRY_HOURS)
+        expiry_hours = expiry_hours or AzureContentUnderstandingClient.SAS_EXPIRY_HOURS
+        expiry_duration = timedelta(hours=expiry_hours)
 
         account_url = f"https://{account_name}.blob.core.windows.net"
-        blob_service_client = BlobServiceClient(account_url=account_url, credential=DefaultAzureCredential())
 
-        # Get user delegation key
+        # Get user delegation key, reused for every SAS issued in the same time bucket.
+        # A bucket key outlives the SAS by up to one bucket, so expiries that would push it past
+        # the service's 7-day limit get a key of their own, capped at the limit.
         start_time = datetime.now(timezone.utc)
         expiry_time = start_time + expiry_duration
-        delegation_key = blob_service_client.get_user_delegation_key(start_time, expiry_time)
+        time_bucket = int(start_time.timestamp()) // USER_DELEGATION_KEY_BUCKET_SECONDS
+        try:
+            if expiry_duration + timedelta(seconds=USER_DELEGATION_KEY_BUCKET_SECONDS) <= USER_DELEGATION_KEY_MAX_LIFETIME:
+                delegation_key = _get_user_delegation_key(account_name, expiry_hours, time_bucket)
+            else:
+                delegation_key = _get_sas_blob_service_client(account_name).get_user_delegation_key(
+                    start_time, min(expiry_time, start_time + USER_DELEGATION_KEY_MAX_LIFETIME)
+                )
+        except ClientAuthenticationError:
+            # lru_cache can't evict a single account, so every cached key is dropped along with
+            # the failing account's client; the next call starts from a fresh client
+            _get_user_delegation_key.cache_clear()
+            with _sas_lock:
+                _sas_blob_service_clients.pop(account_name, None)
+            raise
 
         sas_token = generate_container_sas(
             account_name=account_name,
@@ -240,12 +540,11 @@ class AzureContentUnderstandingClient:
         Raises:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        response = requests.get(
-            url=self._get_analyzer_list_url(self._endpoint, self._api_version),
-            headers=self._headers,
+        response = self._session.get(
+            url=self._get_analyzer_list_url(),
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def get_analyzer_detail_by_id(self, analyzer_id: str) -> Dict[str, Any]:
         """
@@ -261,12 +560,11 @@ class AzureContentUnderstandingClient:
         Raises:
             HTTPError: If the request fails.
         """
-        response = requests.get(
-            url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
-            headers=self._headers,
+        response = self._session.get(
+            url=self._get_analyzer_url(analyzer_id),
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def begin_create_analyzer(
         self,
@@ -306,8 +604,9 @@ class AzureContentUnderstandingClient:
             training_storage_container_sas_url
             and training_storage_container_path_prefix
         ):  # noqa
-            if not training_storage_container_path_prefix.endswith("/"):
-                training_storage_container_path_prefix += "/"
+            training_storage_container_path_prefix = self._normalize_path_prefix(
+                training_storage_container_path_prefix
+            )
             analyzer_template["trainingData"] = self._get_training_data_config(
                 training_storage_container_sas_url,
                 training_storage_container_path_prefix,
@@ -317,19 +616,17 @@ class AzureContentUnderstandingClient:
             pro_mode_reference_docs_storage_container_sas_url
             and pro_mode_reference_docs_storage_container_path_prefix
         ):  # noqa
-            if not pro_mode_reference_docs_storage_container_path_prefix.endswith("/"):
-                pro_mode_reference_docs_storage_container_path_prefix += "/"
+            pro_mode_reference_docs_storage_container_path_prefix = self._normalize_path_prefix(
+                pro_mode_reference_docs_storage_container_path_prefix
+            )
             analyzer_template["knowledgeSources"] = self._get_pro_mode_reference_docs_config(
                 pro_mode_reference_docs_storage_container_sas_url,
                 pro_mode_reference_docs_storage_container_path_prefix,
             )
 
-        headers = {"Content-Type": "application/json"}
-        headers.update(self._headers)
-
-        response = requests.put(
-            url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
-            headers=headers,
+        response = self._session.put(
+            url=self._get_analyzer_url(analyzer_id),
+            headers=self._headers_json,
             json=analyzer_template,
         )
         response.raise_for_status()
@@ -349,9 +646,8 @@ class AzureContentUnderstandingClient:
         Raises:
             HTTPError: If the delete request fails.
         """
-        response = requests.delete(
-            url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
-            headers=self._headers,
+        response = self._session.delete(
+            url=self._get_analyzer_url(analyzer_id),
         )
         response.raise_for_status()
         self._logger.info(f"Analyzer {analyzer_id} deleted.")
@@ -372,51 +668,42 @@ class AzureContentUnderstandingClient:
             ValueError: If the file location is not a valid path or URL.
             HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        data = None
-        file_path = Path(file_location)
-        if file_path.exists():
-            if file_path.is_dir():
-                # Only Pro mode supports multiple input files
-                data = {
-                    "inputs": [
-                        {
-                            "name": "_".join(f.relative_to(file_path).parts),  # flatten the relative file path into a single string using underscores
-                            "data": base64.b64encode(f.read_bytes()).decode("utf-8")
-                        }
-                        for f in file_path.rglob("*")
-                        if f.is_file() and self.is_supported_doc_type_by_file_path(f, is_document=True)
-                    ]
-                }
-                headers = {"Content-Type": "application/json"}
-            elif file_path.is_file():
-                with open(file_location, "rb") as file:
-                    data = file.read()
-                headers = {"Content-Type": "application/octet-stream"}
+        with ExitStack() as stack:
+            data = None
+            if self._is_url(file_location):
+                data = {"url": file_location}
+                headers = self._headers_json
             else:
-                raise ValueError("File location must be a valid and supported file or directory path.")
-        elif "https://" in file_location or "http://" in file_location:
-            data = {"url": file_location}
-            headers = {"Content-Type": "application/json"}
-        else:
-            raise ValueError("File location must be a valid path or URL.")
+                file_path = Path(file_location)
+                if file_path.is_dir():
+                    # Only Pro mode supports multiple input files
+                    input_files = [
+                        f for f in file_path.rglob("*")
+                        if f.is_file() and self._is_supported_suffix(f, is_document=True)
+                    ]
+                    # Streamed as a generator so requests sends it chunked, one base64 chunk at a time
+                    data = self._iter_inputs_json_body(file_path, input_files)
+                    headers = self._headers_json
+                elif file_path.is_file():
+                    data = stack.enter_context(self._map_file(file_location))
+                    headers = self._headers_octet
+                elif file_path.exists():
+                    raise ValueError("File location must be a valid and supported file or directory path.")
+                else:
+                    raise ValueError("File location must be a valid path or URL.")
 
-        headers.update(self._headers)
-        if isinstance(data, dict):
-            response = requests.post(
-                url=self._get_analyze_url(
-                    self._endpoint, self._api_version, analyzer_id
-                ),
-                headers=headers,
-                json=data,
-            )
-        else:
-            response = requests.post(
-                url=self._get_analyze_url(
-                    self._endpoint, self._api_version, analyzer_id
-                ),
-                headers=headers,
-                data=data,
-            )
+            if isinstance(data, dict):
+                response = self._session.post(
+                    url=self._get_analyze_url(analyzer_id),
+                    headers=headers,
+                    json=data,
+                )
+            else:
+                response = self._session.post(
+                    url=self._get_analyze_url(analyzer_id),
+                    headers=headers,
+                    data=data,
+                )
 
         response.raise_for_status()
         self._logger.info(
@@ -424,6 +711,52 @@ class AzureContentUnderstandingClient:
         )
         return response
     
+    @staticmethod
+    @contextmanager
+    def _map_file(file_path: str) -> Iterator[Union[memoryview, bytes]]:
+        """
+        Yields a read-only view of the memory-mapped file as a request body: the socket sends
+        straight from the page cache, with a known length, and a retried request can resend it.
+        Empty files can't be mapped and yield b"" instead.
+        """
+        with open(file_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    @staticmethod
+    def _iter_file_base64(file_path: Path) -> Iterator[bytes]:
+        """
+        Yields the base64 encoding of a file in chunks. Reads are a multiple of 3 bytes,
+        so every chunk but the last encodes without padding and the pieces concatenate cleanly.
+        """
+        with open(file_path, "rb") as file:
+            while True:
+                chunk = file.read(BASE64_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield base64.b64encode(chunk)
+
+    def _iter_inputs_json_body(self, root_path: Path, input_files: List[Path]) -> Iterator[bytes]:
+        """
+        Yields the Pro mode `{"inputs": [{"name": ..., "data": <base64>}, ...]}` JSON body
+        piece by piece, so memory stays at one chunk rather than the whole encoded corpus.
+        """
+        yield b'{"inputs":['
+        for index, f in enumerate(input_files):
+            # flatten the relative file path into a single string using underscores
+            name = "_".join(f.relative_to(root_path).parts)
+            yield (b',{"name":' if index else b'{"name":') + orjson.dumps(name) + b',"data":"'
+            yield from self._iter_file_base64(f)
+            yield b'"}'
+        yield b"]}"
+
     def get_prebuilt_document_analyze_result(self, file_location: str) -> Dict[str, Any]:
         response = self.begin_analyze(
             analyzer_id=self.PREBUILT_DOCUMENT_ANALYZER_ID,
@@ -431,28 +764,112 @@ class AzureContentUnderstandingClient:
         )
         
         return self.poll_result(response, timeout_seconds=POLL_TIMEOUT_SECONDS)
-    
+
+    async def begin_analyze_async(self, analyzer_id: str, file_location: str) -> aiohttp.ClientResponse:
+        """
+        Async counterpart of `begin_analyze`, sent over the shared aiohttp session so the
+        event loop is not blocked while the request is in flight.
+
+        Args:
+            analyzer_id (str): The ID of the analyzer to use.
+            file_location (str): The local path to the file or the URL to analyze.
+
+        Returns:
+            aiohttp.ClientResponse: The released response; its headers carry the operation location.
+
+        Raises:
+            ValueError: If the file location is not a valid path or URL.
+            aiohttp.ClientResponseError: If the HTTP request returned an unsuccessful status code.
+        """
+        session = self._get_aiohttp_session()
+        url = self._get_analyze_url(analyzer_id)
+        if self._is_url(file_location):
+            async with session.post(
+                url, headers=self._get_async_headers(self._headers), json={"url": file_location}
+            ) as response:
+                response.raise_for_status()
+        else:
+            file_path = Path(file_location)
+            if file_path.is_dir():
+                # Only Pro mode supports multiple input files
+                input_files = [
+                    f for f in file_path.rglob("*")
+                    if f.is_file() and self._is_supported_suffix(f, is_document=True)
+                ]
+                body = self._iter_in_thread(self._iter_inputs_json_body(file_path, input_files))
+                async with session.post(url, headers=self._get_async_headers(self._headers_json), data=body) as response:
+                    response.raise_for_status()
+            elif file_path.is_file():
+                # aiohttp reads file objects in an executor, so the upload streams off the loop
+                with open(file_location, "rb") as file:
+                    async with session.post(
+                        url, headers=self._get_async_headers(self._headers_octet), data=file
+                    ) as response:
+                        response.raise_for_status()
+            elif file_path.exists():
+                raise ValueError("File location must be a valid and supported file or directory path.")
+            else:
+                raise ValueError("File location must be a valid path or URL.")
+
+        self._logger.info(
+            f"Analyzing file {file_location} with analyzer: {analyzer_id}"
+        )
+        return response
+
+    @staticmethod
+    async def _iter_in_thread(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+        """Drives a blocking bytes iterator from a worker thread, one item at a time."""
+        while True:
+            chunk = await asyncio.to_thread(next, iterator, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    async def get_prebuilt_document_analyze_result_async(self, file_location: str) -> Dict[str, Any]:
+        async with self._get_analyze_semaphore():
+            response = await self.begin_analyze_async(
+                analyzer_id=self.PREBUILT_DOCUMENT_ANALYZER_ID,
+                file_location=file_location,
+            )
+            return await self.poll_result_async(response, timeout_seconds=POLL_TIMEOUT_SECONDS)
+
     async def _upload_file_to_blob(
         self, container_client: ContainerClient, file_path: str, target_blob_path: str
     ) -> None:
-        with open(file_path, "rb") as data:
-            await container_client.upload_blob(name=target_blob_path, data=data, overwrite=True)
+        async with self._get_upload_semaphore():
+            with open(file_path, "rb") as data:
+                # Passing the length lets the SDK stream the handle in staged blocks,
+                # uploaded in parallel, instead of buffering large files up front.
+                await container_client.upload_blob(
+                    name=target_blob_path,
+                    data=data,
+                    length=os.fstat(data.fileno()).st_size,
+                    overwrite=True,
+                    max_concurrency=4,
+                )
         self._logger.info(f"Uploaded file to {target_blob_path}")
 
     async def _upload_json_to_blob(
         self, container_client: ContainerClient, data: Dict[str, Any], target_blob_path: str
     ) -> None:
-        json_str = json.dumps(data, indent=4)
-        json_bytes = json_str.encode('utf-8')
-        await container_client.upload_blob(name=target_blob_path, data=json_bytes, overwrite=True)
+        # Compact bytes: the knowledge base only ever reads these back as machine input.
+        json_bytes = orjson.dumps(data)
+        async with self._get_upload_semaphore():
+            await container_client.upload_blob(
+                name=target_blob_path,
+                data=json_bytes,
+                length=len(json_bytes),
+                overwrite=True,
+                max_concurrency=4,
+            )
         self._logger.info(f"Uploaded json to {target_blob_path}")
     
     async def upload_jsonl_to_blob(
         self, container_client: ContainerClient, data_list: List[Dict[str, Any]], target_blob_path: str
     ) -> None:
-        jsonl_string = "\n".join(json.dumps(record) for record in data_list)
-        jsonl_bytes = jsonl_string.encode("utf-8")
-        await container_client.upload_blob(name=target_blob_path, data=jsonl_bytes, overwrite=True)
+        jsonl_bytes = b"\n".join(orjson.dumps(record) for record in data_list)
+        async with self._get_upload_semaphore():
+            await container_client.upload_blob(name=target_blob_path, data=jsonl_bytes, overwrite=True)
         self._logger.info(f"Uploaded jsonl to blob '{target_blob_path}'")
 
     async def generate_training_data_on_blob(
@@ -461,121 +878,244 @@ class AzureContentUnderstandingClient:
         storage_container_sas_url: str,
         storage_container_path_prefix: str,
     ) -> None:
-        if not storage_container_path_prefix.endswith("/"):
-            storage_container_path_prefix += "/"
-        
-        async with ContainerClient.from_container_url(storage_container_sas_url) as container_client:
-            for filename in os.listdir(training_docs_folder):
-                file_path = os.path.join(training_docs_folder, filename)
-                _, file_ext = os.path.splitext(filename)
-                if os.path.isfile(file_path) and (
-                        file_ext == "" or file_ext.lower() in self.SUPPORTED_FILE_TYPES_DOCUMENT):
-                    # Training feature only supports Standard mode with document data
-                    # Document files uploaded to AI Foundry will be convert to uuid without extension
-                    label_filename = filename + self.LABEL_FILE_SUFFIX
-                    label_path = os.path.join(training_docs_folder, label_filename)
-                    ocr_result_filename = filename + self.OCR_RESULT_FILE_SUFFIX
-                    ocr_result_path = os.path.join(training_docs_folder, ocr_result_filename)
-                    if os.path.exists(label_path) and os.path.exists(ocr_result_path):
-                        file_blob_path = storage_container_path_prefix + filename
-                        label_blob_path = storage_container_path_prefix + label_filename
-                        ocr_result_blob_path = storage_container_path_prefix + ocr_result_filename
-
-                        # Upload files
-                        await self._upload_file_to_blob(container_client, file_path, file_blob_path)
-                        await self._upload_file_to_blob(container_client, label_path, label_blob_path)
-                        await self._upload_file_to_blob(container_client, ocr_result_path, ocr_result_blob_path)
-                        self._logger.info(f"Uploaded training data for {filename}")
-                    else:
-                        raise FileNotFoundError(
-                            f"Label file '{label_filename}' or OCR result file '{ocr_result_filename}' "
-                            f"does not exist in '{training_docs_folder}'. "
-                            f"Please ensure both files exist for '{filename}'."
-                        )
-
-    def _get_analyze_list(
-        self,
-        reference_docs_folder: str,
-    ) -> List[ReferenceDocItem]:
-        """
-        Returns a list of ReferenceDocItem objects for files in the given folder that need to be analyzed.
-        """
-        analyze_list: List[ReferenceDocItem] = []
-
-        for dirpath, _, filenames in os.walk(reference_docs_folder):
-            for filename in filenames:
-                _, file_ext = os.path.splitext(filename)
-                if self.is_supported_doc_type_by_file_ext(file_ext, is_document=True):
-                    file_path = os.path.join(dirpath, filename)
-                    result_file_name = filename + self.OCR_RESULT_FILE_SUFFIX
-                    analyze_list.append(
-                        ReferenceDocItem(
-                            filename=filename,
-                            file_path=file_path,
-                            result_file_name=result_file_name,
-                        )
+        prefix = self._normalize_path_prefix(storage_container_path_prefix)
+
+        container_client = self._get_container_client(storage_container_sas_url)
+        # One scandir answers both the is-file checks and the label/OCR existence checks.
+        with os.scandir(training_docs_folder) as it:
+            entries = {entry.name: entry for entry in it}
+        for filename, entry in entries.items():
+            file_ext = self._get_file_ext(filename)
+            if entry.is_file() and (
+                    file_ext == "" or file_ext.lower() in self.SUPPORTED_FILE_TYPES_DOCUMENT):
+                # Training feature only supports Standard mode with document data
+                # Document files uploaded to AI Foundry will be convert to uuid without extension
+                file_path = entry.path
+                label_filename = filename + self.LABEL_FILE_SUFFIX
+                label_path = os.path.join(training_docs_folder, label_filename)
+                ocr_result_filename = filename + self.OCR_RESULT_FILE_SUFFIX
+                ocr_result_path = os.path.join(training_docs_folder, ocr_result_filename)
+                if label_filename in entries and ocr_result_filename in entries:
+                    file_blob_path = f"{prefix}{filename}"
+                    label_blob_path = f"{prefix}{label_filename}"
+                    ocr_result_blob_path = f"{prefix}{ocr_result_filename}"
+
+                    # Upload files
+                    await asyncio.gather(
+                        self._upload_file_to_blob(container_client, file_path, file_blob_path),
+                        self._upload_file_to_blob(container_client, label_path, label_blob_path),
+                        self._upload_file_to_blob(container_client, ocr_result_path, ocr_result_blob_path),
                     )
+                    self._logger.info(f"Uploaded training data for {filename}")
                 else:
-                    raise ValueError(
-                        f"File '{filename}' is not a supported document type, "
-                        f"please remove it or convert it to a supported type."
+                    raise FileNotFoundError(
+                        f"Label file '{label_filename}' or OCR result file '{ocr_result_filename}' "
+                        f"does not exist in '{training_docs_folder}'. "
+                        f"Please ensure both files exist for '{filename}'."
                     )
 
-        return analyze_list
+    @staticmethod
+    def _normalize_path_prefix(path_prefix: str) -> str:
+        """Returns the blob path prefix with exactly one trailing slash appended if missing."""
+        return path_prefix if path_prefix.endswith("/") else path_prefix + "/"
 
-    def _get_upload_only_list(
-        self,
-        reference_docs_folder: str,
-    ) -> List[ReferenceDocItem]:
+    @staticmethod
+    def _walk_dirs(
+        folder: str, dir_mtimes: Optional[Dict[str, int]] = None
+    ) -> Iterator[Tuple[str, List[str]]]:
         """
-        Returns a list of ReferenceDocItem objects for files in the given folder that already have OCR results
+        Yields (dirpath, filenames) for the folder and all its subfolders, top-down like os.walk,
+        but with a single os.scandir per directory so file/dir checks use the cached entry type.
+        If dir_mtimes is given, the mtime of each directory is recorded in it before listing.
+        Like os.walk, a directory that is missing or can't be read is skipped rather than raising;
+        it is recorded with an mtime of -1, which no later stat matches.
+        """
+        pending = [folder]
+        while pending:
+            dirpath = pending.pop()
+            filenames: List[str] = []
+            subdirs: List[str] = []
+            try:
+                mtime_ns = os.stat(dirpath).st_mtime_ns if dir_mtimes is not None else None
+                with os.scandir(dirpath) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            # Symlinked directories are neither descended into, like
+                            # os.walk(followlinks=False), nor reported as files
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        else:
+                            filenames.append(entry.name)
+            except OSError:
+                if dir_mtimes is not None:
+                    dir_mtimes[dirpath] = -1
+                continue
+            if dir_mtimes is not None:
+                dir_mtimes[dirpath] = mtime_ns
+            yield dirpath, filenames
+            pending.extend(reversed(subdirs))
+
+    @staticmethod
+    def _get_file_ext(filename: str) -> str:
         """
-        upload_only_list: List[ReferenceDocItem] = []
+        Returns the extension of a file name like os.path.splitext, without the tuple and
+        root allocations. Leading dots of hidden files don't start an extension.
+        """
+        dot = filename.rfind(".")
+        if dot <= 0 or (filename[0] == "." and not filename[:dot].strip(".")):
+            return ""
+        return filename[dot:]
+
+    def _classify_reference_docs(self, reference_docs_folder: str) -> ReferenceDocsClassification:
+        """
+        Returns the classification of the reference docs folder, reusing the previous walk while
+        none of its directories has been modified since. Adding, removing or renaming a file
+        bumps its directory's mtime, which is all the classification depends on.
+        """
+        cached = self._reference_docs_cache.get(reference_docs_folder)
+        if cached is not None:
+            dir_mtimes, classification = cached
+            try:
+                if all(os.stat(dirpath).st_mtime_ns == mtime for dirpath, mtime in dir_mtimes.items()):
+                    return classification
+            except OSError:
+                pass
+
+        dir_mtimes, classification = self._walk_reference_docs(reference_docs_folder)
+        # A directory modified within the file system's timestamp granularity of the walk could
+        # change again without its mtime moving, so only cache walks of settled folders.
+        if max(dir_mtimes.values()) < time.time_ns() - 2_000_000_000:
+            self._reference_docs_cache[reference_docs_folder] = (dir_mtimes, classification)
+        else:
+            self._reference_docs_cache.pop(reference_docs_folder, None)
+        return classification
 
-        for dirpath, _, filenames in os.walk(reference_docs_folder):
+    def _walk_reference_docs(
+        self, reference_docs_folder: str
+    ) -> Tuple[Dict[str, int], ReferenceDocsClassification]:
+        """
+        Walks the reference docs folder once and classifies every file for both the analyze
+        and the upload-only flows. The first problem found for each flow is recorded rather
+        than raised, so callers can pick the list they need and raise only its error.
+        Also returns the mtime of every directory walked, taken before it was listed.
+        """
+        dir_mtimes: Dict[str, int] = {}
+        classification = ReferenceDocsClassification()
+        supported_types = self.SUPPORTED_FILE_TYPES_DOCUMENT
+        result_suffix = self.OCR_RESULT_FILE_SUFFIX
+        result_suffix_len = len(result_suffix)
+
+        for dirpath, filenames in self._walk_dirs(reference_docs_folder, dir_mtimes):
+            dir_filenames = set(filenames)
             for filename in filenames:
-                _, file_ext = os.path.splitext(filename)
-                if self.is_supported_doc_type_by_file_ext(file_ext, is_document=True):
+                if self._get_file_ext(filename).lower() in supported_types:
                     file_path = os.path.join(dirpath, filename)
-                    result_file_name = filename + self.OCR_RESULT_FILE_SUFFIX
-                    result_file_path = os.path.join(dirpath, result_file_name)
-                    if not os.path.exists(result_file_path):
-                        raise FileNotFoundError(
-                            f"Result file '{result_file_name}' does not exist in '{dirpath}'. "
-                            f"Please run analyze first or remove this file from the folder."
-                        )
-                    upload_only_list.append(
+                    result_file_name = filename + result_suffix
+                    classification.analyze_list.append(
                         ReferenceDocItem(
                             filename=filename,
                             file_path=file_path,
                             result_file_name=result_file_name,
-                            result_file_path=result_file_path,
                         )
                     )
-                elif filename.endswith(self.OCR_RESULT_FILE_SUFFIX):
-                    original_filename = filename.replace(self.OCR_RESULT_FILE_SUFFIX, "")
-                    if original_filename in filenames:
+                    if result_file_name in dir_filenames:
+                        classification.upload_only_list.append(
+                            ReferenceDocItem(
+                                filename=filename,
+                                file_path=file_path,
+                                result_file_name=result_file_name,
+                                result_file_path=os.path.join(dirpath, result_file_name),
+                            )
+                        )
+                    elif classification.upload_only_error is None:
+                        classification.upload_only_error = FileNotFoundError(
+                            f"Result file '{result_file_name}' does not exist in '{dirpath}'. "
+                            f"Please run analyze first or remove this file from the folder."
+                        )
+                    continue
+
+                unsupported_error = ValueError(
+                    f"File '{filename}' is not a supported document type, "
+                    f"please remove it or convert it to a supported type."
+                )
+                if classification.analyze_error is None:
+                    classification.analyze_error = unsupported_error
+                if classification.upload_only_error is not None:
+                    continue
+                if filename[-result_suffix_len:] == result_suffix:
+                    original_filename = filename[:-result_suffix_len]
+                    if original_filename in dir_filenames:
                         # skip result.json files corresponding to the file with supported document type
-                        _, original_file_ext = os.path.splitext(original_filename)
-                        if self.is_supported_doc_type_by_file_ext(original_file_ext, is_document=True):
-                            continue
-                        else:
-                            raise ValueError(
+                        if self._get_file_ext(original_filename).lower() not in supported_types:
+                            classification.upload_only_error = ValueError(
                                 f"The '{original_filename}' is not a supported document type, "
                                 f"please remove the result file '{filename}' and '{original_filename}'."
                             )
                     else:
-                        raise ValueError(
+                        classification.upload_only_error = ValueError(
                             f"Result file '{filename}' is not corresponding to an original file, "
                             f"please remove it."
                         )
                 else:
-                    raise ValueError(
-                        f"File '{filename}' is not a supported document type, "
-                        f"please remove it or convert it to a supported type."
-                    )
+                    classification.upload_only_error = unsupported_error
 
-        return upload_only_list
+        return dir_mtimes, classification
+
+    def _get_analyze_list(
+        self,
+        reference_docs_folder: str,
+    ) -> List[ReferenceDocItem]:
+        """
+        Returns a list of ReferenceDocItem objects for files in the given folder that need to be analyzed.
+        """
+        classification = self._classify_reference_docs(reference_docs_folder)
+        if classification.analyze_error is not None:
+            raise classification.analyze_error
+        return classification.analyze_list
+
+    def _get_upload_only_list(
+        self,
+        reference_docs_folder: str,
+    ) -> List[ReferenceDocItem]:
+        """
+        Returns a list of ReferenceDocItem objects for files in the given folder that already have OCR results
+        """
+        classification = self._classify_reference_docs(reference_docs_folder)
+        if classification.upload_only_error is not None:
+            raise classification.upload_only_error
+        return classification.upload_only_list
+
+    async def _analyze_and_upload_reference_doc(
+        self,
+        container_client: ContainerClient,
+        analyze_item: ReferenceDocItem,
+        storage_container_path_prefix: str,
+    ) -> Dict[str, str]:
+        """
+        Analyzes a single reference document and uploads it together with its result.
+        Analyses run on the event loop, gated by the analyze semaphore, so several
+        documents can be analyzed while earlier results are still uploading.
+        """
+        self._logger.info(f"Analyzing result for {analyze_item.filename}")
+        try:
+            analyze_result = await self.get_prebuilt_document_analyze_result_async(analyze_item.file_path)
+        except Exception as e:
+            self._logger.error(
+                f"Error of getting analyze result of '{analyze_item.filename}'. "
+                f"Please check the error message and consider retrying or removing this file."
+                )
+            raise e
+        result_file_blob_path = f"{storage_container_path_prefix}{analyze_item.result_file_name}"
+        file_blob_path = f"{storage_container_path_prefix}{analyze_item.filename}"
+        await asyncio.gather(
+            self._upload_json_to_blob(container_client, analyze_result, result_file_blob_path),
+            self._upload_file_to_blob(container_client, analyze_item.file_path, file_blob_path),
+        )
+        return {"file": analyze_item.filename, "resultFile": analyze_item.result_file_name}
 
     async def generate_knowledge_base_on_blob(
         self,
@@ -592,51 +1132,47 @@ class AzureContentUnderstandingClient:
             storage_container_path_prefix (str): The path prefix within the storage container where files will be
             skip_analyze (bool): If True, skips the analysis step and only uploads existing result files.
         """
-        if not storage_container_path_prefix.endswith("/"):
-            storage_container_path_prefix += "/"
-        
+        prefix = self._normalize_path_prefix(storage_container_path_prefix)
+
         resources = []
-        async with ContainerClient.from_container_url(storage_container_sas_url) as container_client:
-            if not skip_analyze:
-                analyze_list = self._get_analyze_list(reference_docs_folder)
-                for analyze_item in analyze_list:
-                    self._logger.info(f"Analyzing result for {analyze_item.filename}")
-                    try:
-                        analyze_result = self.get_prebuilt_document_analyze_result(analyze_item.file_path)
-                    except Exception as e:
-                        self._logger.error(
-                            f"Error of getting analyze result of '{analyze_item.filename}'. "
-                            f"Please check the error message and consider retrying or removing this file."
-                            )
-                        raise e
-                    result_file_blob_path = storage_container_path_prefix + analyze_item.result_file_name
-                    file_blob_path = storage_container_path_prefix + analyze_item.filename
-                    await self._upload_json_to_blob(container_client, analyze_result, result_file_blob_path)
-                    await self._upload_file_to_blob(container_client, analyze_item.file_path, file_blob_path)
-                    resources.append({"file": analyze_item.filename, "resultFile": analyze_item.result_file_name})
-            else:
-                upload_list = self._get_upload_only_list(reference_docs_folder)
-                for upload_item in upload_list:
-                    self._logger.info(f"Using existing result.json for '{upload_item.filename}'")
-                    result_file_blob_path = storage_container_path_prefix + upload_item.result_file_name
-                    file_blob_path = storage_container_path_prefix + upload_item.filename
-                    await self._upload_file_to_blob(container_client, upload_item.file_path, file_blob_path)
-                    await self._upload_file_to_blob(container_client, upload_item.result_file_path, result_file_blob_path)
-                    resources.append({"file": upload_item.filename, "resultFile": upload_item.result_file_name})
-
-            # Upload sources.jsonl
-            await self.upload_jsonl_to_blob(
-                container_client, resources, storage_container_path_prefix + self.KNOWLEDGE_SOURCE_LIST_FILE_NAME)
+        container_client = self._get_container_client(storage_container_sas_url)
+        if not skip_analyze:
+            analyze_list = self._get_analyze_list(reference_docs_folder)
+            resources = await asyncio.gather(*(
+                self._analyze_and_upload_reference_doc(
+                    container_client, analyze_item, prefix
+                )
+                for analyze_item in analyze_list
+            ))
+        else:
+            upload_list = self._get_upload_only_list(reference_docs_folder)
+            for upload_item in upload_list:
+                self._logger.info(f"Using existing result.json for '{upload_item.filename}'")
+                result_file_blob_path = f"{prefix}{upload_item.result_file_name}"
+                file_blob_path = f"{prefix}{upload_item.filename}"
+                await asyncio.gather(
+                    self._upload_file_to_blob(container_client, upload_item.file_path, file_blob_path),
+                    self._upload_file_to_blob(container_client, upload_item.result_file_path, result_file_blob_path),
+                )
+                resources.append({"file": upload_item.filename, "resultFile": upload_item.result_file_name})
+
+        # Upload sources.jsonl
+        await self.upload_jsonl_to_blob(
+            container_client, resources, f"{prefix}{self.KNOWLEDGE_SOURCE_LIST_FILE_NAME}")
 
     def get_image_from_analyze_operation(
-        self, analyze_response: Response, image_id: str
+        self, analyze_response: Response, image_id: str, out_stream: Optional[BinaryIO] = None
     ) -> Optional[bytes]:
         """Retrieves an image from the analyze operation using the image ID.
         Args:
             analyze_response (Response): The response object from the analyze operation.
             image_id (str): The ID of the image to retrieve.
+            out_stream (BinaryIO, optional): A writable binary stream. When given, the image is
+                streamed into it instead of being returned, so it is never held in memory whole.
         Returns:
-            bytes: The image content as a byte string.
+            bytes: The image content as a byte string, or None if out_stream was given or the request failed.
+        Raises:
+            ValueError: If the service returns something other than a JPEG image.
         """
         operation_location = analyze_response.headers.get("operation-location", "")
         if not operation_location:
@@ -648,14 +1184,20 @@ class AzureContentUnderstandingClient:
             f"{operation_location}/files/{image_id}?api-version={self._api_version}"
         )
         try:
-            response = requests.get(url=image_retrieval_url, headers=self._headers)
-            response.raise_for_status()
-
-            assert response.headers.get("Content-Type") == "image/jpeg"
-
-            return response.content
-        except requests.exceptions.RequestException as e:
-            print(f"HTTP request failed: {e}")
+            with self._session.get(url=image_retrieval_url, stream=True) as response:
+                response.raise_for_status()
+
+                content_type = response.headers.get("Content-Type")
+                if content_type != "image/jpeg":
+                    raise ValueError(f"Expected an image/jpeg response, got '{content_type}'.")
+
+                response.raw.decode_content = True
+                if out_stream is None:
+                    return response.raw.read()
+                shutil.copyfileobj(response.raw, out_stream)
+                return None
+        except requests.exceptions.RequestException:
+            self._logger.exception("HTTP request failed")
             return None
 
     def begin_create_classifier(
@@ -683,12 +1225,9 @@ class AzureContentUnderstandingClient:
         if not classifier_id:
             raise ValueError("Classifier ID must be provided.")
 
-        headers = {"Content-Type": "application/json"}
-        headers.update(self._headers)
-
-        response = requests.put(
-            url=self._get_classifier_url(self._endpoint, self._api_version, classifier_id),
-            headers=headers,
+        response = self._session.put(
+            url=self._get_classifier_url(classifier_id),
+            headers=self._headers_json,
             json=classifier_schema,
         )
         response.raise_for_status()
@@ -710,54 +1249,134 @@ class AzureContentUnderstandingClient:
             ValueError: If the file location is not a valid path or URL.
             HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        data = None
-        if Path(file_location).exists():
-            with open(file_location, "rb") as file:
-                data = file.read()
-            headers = {"Content-Type": "application/octet-stream"}
-        elif "https://" in file_location or "http://" in file_location:
-            data = {"url": file_location}
-            headers = {"Content-Type": "application/json"}
+        if self._is_url(file_location):
+            response = self._session.post(
+                url=self._get_classify_url(classifier_id),
+                headers=self._headers_json,
+                json={"url": file_location},
+            )
+        elif Path(file_location).is_file():
+            with self._map_file(file_location) as data:
+                response = self._session.post(
+                    url=self._get_classify_url(classifier_id),
+                    headers=self._headers_octet,
+                    data=data,
+                )
         else:
             raise ValueError("File location must be a valid path or URL.")
 
-        headers.update(self._headers)
-        if isinstance(data, dict):
-            response = requests.post(
-                url=self._get_classify_url(
-                    self._endpoint, self._api_version, classifier_id
-                ),
-                headers=headers,
-                json=data,
+        response.raise_for_status()
+        self._logger.info(
+            f"Analyzing file {file_location} with classifier_id: {classifier_id}"
+        )
+        self._prewarm_operation_host(response)
+        return response
+
+    def _prewarm_operation_host(self, response: Response) -> None:
+        """
+        Opens a pooled connection to the operation-location host when it differs from the
+        endpoint (regional routing), so the first poll doesn't pay the TLS handshake.
+        Best effort: the HEAD goes straight to the adapter's pool with retries off, so a
+        failure costs at most one 2 s timeout and is left for the poll itself to surface.
+        """
+        operation_location = urlsplit(response.headers.get("operation-location", ""))
+        if not operation_location.netloc or operation_location.netloc == self._endpoint_netloc:
+            return
+        try:
+            pool = self._adapter.poolmanager.connection_from_url(
+                f"{operation_location.scheme}://{operation_location.netloc}/"
             )
+            pool.urlopen(
+                "HEAD", "/", retries=False, redirect=False, timeout=2, preload_content=False
+            ).release_conn()
+        except (urllib3.exceptions.HTTPError, OSError):
+            pass
+
+    async def begin_classify_async(self, classifier_id: str, file_location: str) -> aiohttp.ClientResponse:
+        """
+        Async counterpart of `begin_classify`, sent over the shared aiohttp session so many
+        classifications can be started and polled concurrently on one event loop.
+
+        Args:
+            classifier_id (str): The ID of the classifier to use.
+            file_location (str): The local path to the file or the URL to analyze.
+
+        Returns:
+            aiohttp.ClientResponse: The released response; its headers carry the operation location.
+
+        Raises:
+            ValueError: If the file location is not a valid path or URL.
+            aiohttp.ClientResponseError: If the HTTP request returned an unsuccessful status code.
+        """
+        session = self._get_aiohttp_session()
+        url = self._get_classify_url(classifier_id)
+        if self._is_url(file_location):
+            async with session.post(
+                url, headers=self._get_async_headers(self._headers), json={"url": file_location}
+            ) as response:
+                response.raise_for_status()
+        elif Path(file_location).is_file():
+            # aiohttp reads file objects in an executor, so the upload streams off the loop
+            with open(file_location, "rb") as file:
+                async with session.post(
+                        url, headers=self._get_async_headers(self._headers_octet), data=file
+                    ) as response:
+                    response.raise_for_status()
         else:
-            response = requests.post(
-                url=self._get_classify_url(
-                    self._endpoint, self._api_version, classifier_id
-                ),
-                headers=headers,
-                data=data,
-            )
+            raise ValueError("File location must be a valid path or URL.")
 
-        response.raise_for_status()
         self._logger.info(
             f"Analyzing file {file_location} with classifier_id: {classifier_id}"
         )
         return response
 
+    def classify_file(
+        self, classifier_id: str, file_location: str, timeout_seconds: int = POLL_TIMEOUT_SECONDS
+    ) -> "Future[Dict[str, Any]]":
+        """
+        Classifies a file or URL on the client's thread pool and returns a Future of the result,
+        so several files can be classified at once over the shared session without asyncio.
+        Use `concurrent.futures.as_completed` to handle results as they finish.
+        """
+        return self._executor.submit(self._classify_blocking, classifier_id, file_location, timeout_seconds)
+
+    def _classify_blocking(
+        self, classifier_id: str, file_location: str, timeout_seconds: int
+    ) -> Dict[str, Any]:
+        response = self.begin_classify(classifier_id, file_location)
+        return self.poll_result(response, timeout_seconds=timeout_seconds)
+
+    async def classify_and_poll_async(
+        self, classifier_id: str, file_location: str, timeout_seconds: int = POLL_TIMEOUT_SECONDS
+    ) -> Dict[str, Any]:
+        """
+        Classifies a file or URL and waits for the result without blocking the event loop.
+        Calls are gated by the analyze semaphore, so callers can `asyncio.gather` one call
+        per file and let the client bound how many run at once.
+        """
+        async with self._get_analyze_semaphore():
+            response = await self.begin_classify_async(classifier_id, file_location)
+            return await self.poll_result_async(response, timeout_seconds=timeout_seconds)
+
     def poll_result(
         self,
         response: Response,
         timeout_seconds: int = POLL_TIMEOUT_SECONDS,
-        polling_interval_seconds: int = 2,
+        polling_interval_seconds: float = 0.5,
+        max_polling_interval_seconds: float = 10.0,
     ) -> Dict[str, Any]:
         """
         Polls the result of an asynchronous operation until it completes or times out.
+        The wait between polls is drawn uniformly from `polling_interval_seconds` up to an
+        exponentially growing bound capped at `max_polling_interval_seconds` ("full jitter"),
+        so short jobs return quickly, long jobs are polled less often and clients started
+        together drift apart. A Retry-After header from the service takes precedence.
 
         Args:
             response (Response): The initial response object containing the operation location.
             timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
-            polling_interval_seconds (int, optional): The number of seconds to wait between polling attempts. Defaults to 2.
+            polling_interval_seconds (float, optional): The shortest wait between polls, in seconds. Defaults to 0.5.
+            max_polling_interval_seconds (float, optional): The upper bound for the wait between polls. Defaults to 10.
 
         Raises:
             ValueError: If the operation location is not found in the response headers.
@@ -771,30 +1390,243 @@ class AzureContentUnderstandingClient:
         if not operation_location:
             raise ValueError("Operation location not found in response headers.")
 
-        headers = {"Content-Type": "application/json"}
-        headers.update(self._headers)
-
-        start_time = time.time()
+        operation_id = urlsplit(operation_location).path.rsplit("/", 1)[-1]
+        attempt = 0
+        transient_errors = 0
+        etag = None
+        deadline = time.monotonic() + timeout_seconds
         while True:
-            elapsed_time = time.time() - start_time
-            if elapsed_time > timeout_seconds:
+            if time.monotonic() > deadline:
                 raise TimeoutError(
                     f"Operation timed out after {timeout_seconds:.2f} seconds."
                 )
 
-            response = requests.get(operation_location, headers=self._headers)
+            try:
+                # An unchanged operation answers 304 to If-None-Match, so there's nothing to decode
+                response = self._session.get(
+                    operation_location, headers={"If-None-Match": etag} if etag else None
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout,
+            ) as e:
+                transient_errors += 1
+                if transient_errors > self.MAX_POLL_TRANSIENT_ERRORS:
+                    raise
+                self._logger.warning(f"Polling request {operation_id} failed, retrying: {e}")
+                time.sleep(self._clamp_to_deadline(
+                    self._get_backoff_delay(attempt, polling_interval_seconds, max_polling_interval_seconds),
+                    deadline,
+                ))
+                attempt += 1
+                continue
+            if response.status_code == 429 or response.status_code >= 500:
+                # Throttled or a service blip: wait as long as the service asks, capped at the
+                # deadline, then poll again. Only 5xx counts towards giving up.
+                if response.status_code >= 500:
+                    transient_errors += 1
+                    if transient_errors > self.MAX_POLL_TRANSIENT_ERRORS:
+                        response.raise_for_status()
+                time.sleep(self._clamp_to_deadline(
+                    self._get_retry_after_seconds(response)
+                    or self._get_backoff_delay(attempt, polling_interval_seconds, max_polling_interval_seconds),
+                    deadline,
+                ))
+                attempt += 1
+                continue
+            transient_errors = 0
             response.raise_for_status()
-            status = response.json().get("status").lower()
-            if status == "succeeded":
-                self._logger.info(
-                    f"Request result is ready after {elapsed_time:.2f} seconds."
+            if response.status_code != 304:
+                etag = response.headers.get("ETag")
+                body = orjson.loads(response.content)
+                status = body.get("status", "").lower()
+                if status == "succeeded":
+                    self._logger.info(
+                        f"Request result is ready after "
+                        f"{timeout_seconds - (deadline - time.monotonic()):.2f} seconds."
+                    )
+                    return body
+                elif status == "failed":
+                    self._logger.error(f"Request failed. Reason: {body}")
+                    raise RuntimeError("Request failed.")
+            self._logger.info(
+                f"Request {operation_id} in progress ..."
+            )
+            time.sleep(self._clamp_to_deadline(
+                self._get_retry_after_seconds(response)
+                or self._get_backoff_delay(attempt, polling_interval_seconds, max_polling_interval_seconds),
+                deadline,
+            ))
+            attempt += 1
+
+    def poll_many(
+        self, responses: List[Response], timeout_seconds: int = POLL_TIMEOUT_SECONDS
+    ) -> List[Dict[str, Any]]:
+        """
+        Polls several operations at once on the client's thread pool, sharing the pooled session's
+        keep-alive connections, and returns their results in the order of `responses`.
+        Raises the first error in that order, like `poll_result` would.
+        """
+        return list(self._executor.map(
+            lambda response: self.poll_result(response, timeout_seconds=timeout_seconds),
+            responses,
+        ))
+
+    async def poll_result_async(
+        self,
+        response: aiohttp.ClientResponse,
+        timeout_seconds: int = POLL_TIMEOUT_SECONDS,
+        polling_interval_seconds: float = 0.5,
+        max_polling_interval_seconds: float = 10.0,
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of `poll_result`: polls over the shared aiohttp session and waits
+        with asyncio.sleep, so other coroutines keep running between polls.
+
+        Args:
+            response (aiohttp.ClientResponse): The initial response object containing the operation location.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
+            polling_interval_seconds (float, optional): The shortest wait between polls, in seconds. Defaults to 0.5.
+            max_polling_interval_seconds (float, optional): The upper bound for the wait between polls. Defaults to 10.
+
+        Raises:
+            ValueError: If the operation location is not found in the response headers.
+            TimeoutError: If the operation does not complete within the specified timeout.
+            RuntimeError: If the operation fails.
+
+        Returns:
+            dict: The JSON response of the completed operation if it succeeds.
+        """
+        operation_location = response.headers.get("operation-location", "")
+        if not operation_location:
+            raise ValueError("Operation location not found in response headers.")
+
+        session = self._get_aiohttp_session()
+        operation_id = urlsplit(operation_location).path.rsplit("/", 1)[-1]
+        attempt = 0
+        transient_errors = 0
+        etag = None
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Operation timed out after {timeout_seconds:.2f} seconds."
                 )
-                return response.json()
-            elif status == "failed":
-                self._logger.error(f"Request failed. Reason: {response.json()}")
-                raise RuntimeError("Request failed.")
-            else:
+
+            headers = self._get_async_headers(self._headers)
+            if etag:
+                headers = {**headers, "If-None-Match": etag}
+            status_code = None
+            retry_after = None
+            body = None
+            try:
+                async with session.get(operation_location, headers=headers) as poll_response:
+                    status_code = poll_response.status
+                    retry_after = self._get_retry_after_seconds(poll_response)
+                    if status_code >= 500:
+                        transient_errors += 1
+                        if transient_errors > self.MAX_POLL_TRANSIENT_ERRORS:
+                            poll_response.raise_for_status()
+                    elif status_code not in (304, 429):
+                        poll_response.raise_for_status()
+                        etag = poll_response.headers.get("ETag")
+                        body = orjson.loads(await poll_response.read())
+                        transient_errors = 0
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                transient_errors += 1
+                if transient_errors > self.MAX_POLL_TRANSIENT_ERRORS:
+                    raise
+                self._logger.warning(f"Polling request {operation_id} failed, retrying: {e}")
+            if body is not None:
+                status = body.get("status", "").lower()
+                if status == "succeeded":
+                    self._logger.info(
+                        f"Request result is ready after "
+                        f"{timeout_seconds - (deadline - time.monotonic()):.2f} seconds."
+                    )
+                    return body
+                elif status == "failed":
+                    self._logger.error(f"Request failed. Reason: {body}")
+                    raise RuntimeError("Request failed.")
+            if status_code is not None and status_code < 500 and status_code != 429:
                 self._logger.info(
-                    f"Request {operation_location.split('/')[-1].split('?')[0]} in progress ..."
+                    f"Request {operation_id} in progress ..."
                 )
-            time.sleep(polling_interval_seconds)
\ No newline at end of file
+            await asyncio.sleep(self._clamp_to_deadline(
+                retry_after
+                or self._get_backoff_delay(attempt, polling_interval_seconds, max_polling_interval_seconds),
+                deadline,
+            ))
+            attempt += 1
+
+    @staticmethod
+    def _clamp_to_deadline(wait_seconds: float, deadline: float) -> float:
+        """Shortens a wait so it never runs past the monotonic deadline, leaving one last poll on time."""
+        return max(0.0, min(wait_seconds, deadline - time.monotonic()))
+
+    @staticmethod
+    def _get_backoff_delay(attempt: int, initial_seconds: float, max_seconds: float) -> float:
+        """
+        Returns a "full jitter" backoff delay for the given zero-based attempt: a uniform draw
+        between initial_seconds and initial_seconds * 2**attempt, capped at max_seconds.
+        """
+        upper = min(max(max_seconds, initial_seconds), initial_seconds * 2 ** min(attempt, 32))
+        return random.uniform(initial_seconds, upper)
+
+    @staticmethod
+    def _get_retry_after_seconds(response: Response) -> Optional[float]:
+        """Returns the Retry-After header of the response in seconds, or None if absent or invalid."""
+        retry_after = response.headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+_clients_lock = threading.Lock()
+
+
+# Unbounded: an evicted client would be dropped without close(), leaking its sessions and threads
+@lru_cache(maxsize=None)
+def _get_cached_client(
+    endpoint: str,
+    api_version: str,
+    subscription_key: Optional[str],
+    token_provider: Optional[Callable[[], str]],
+    x_ms_useragent: str,
+) -> AzureContentUnderstandingClient:
+    return AzureContentUnderstandingClient(
+        endpoint=endpoint,
+        api_version=api_version,
+        subscription_key=subscription_key,
+        token_provider=token_provider,
+        x_ms_useragent=x_ms_useragent,
+    )
+
+
+def get_client(
+    endpoint: str,
+    api_version: str,
+    subscription_key: str = None,
+    token_provider: callable = None,
+    x_ms_useragent: str = "cu-sample-code",
+) -> AzureContentUnderstandingClient:
+    """
+    Returns a process-wide AzureContentUnderstandingClient for the given settings, so warm
+    Function invocations share its connection pools, DNS cache and worker threads.
+    Clients are keyed by the token provider's identity, so callers should reuse one
+    provider (and its credential) rather than create a new one per invocation.
+    The returned client is shared and lives for the life of the process: don't close it.
+    """
+    with _clients_lock:
+        return _get_cached_client(endpoint, api_version, subscription_key, token_provider, x_ms_useragent)
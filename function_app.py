@@ -1,19 +1,113 @@
-from io import BytesIO
+from io import BytesIO, RawIOBase
+import asyncio
 import azure.functions as func
-import datetime
 import os
-import json
 import logging
+import orjson
+import threading
+import time
+from typing import Final
 
 from certifi import contents
-from content_understanding_client import AzureContentUnderstandingClient
-from azure.identity import ClientSecretCredential, get_bearer_token_provider
-from azure.storage.blob import BlobServiceClient
+from content_understanding_client import get_client
+from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+from azure.storage.blob import BlobServiceClient, BlobType, ContentSettings
 
 app = func.FunctionApp()
 
+# **************************************************************
+# Configuration is read once when the worker imports the module.
+# Missing settings are logged here and raised on first use, so the
+# host can still index and serve the functions that don't need them.
+# The service principal settings (AZURE_CLIENT_ID, AZURE_CLIENT_SECRET,
+# AZURE_TENANT_ID) are optional: DefaultAzureCredential reads them itself
+# and falls back to the Function App's managed identity without them
+# **************************************************************
+SERVICE_FOR_CU: Final = os.getenv("SERVICE_FOR_CU")
+SERVICE_API_FOR_CU: Final = os.getenv("SERVICE_API_FOR_CU")
+
+_REQUIRED_SETTINGS = {
+    "SERVICE_FOR_CU": SERVICE_FOR_CU,
+    "SERVICE_API_FOR_CU": SERVICE_API_FOR_CU,
+}
+_MISSING_SETTINGS = [name for name, value in _REQUIRED_SETTINGS.items() if not value]
+if _MISSING_SETTINGS:
+    logging.error(f"Missing required environment variables: {', '.join(_MISSING_SETTINGS)}")
+
+def _require_settings(*names):
+    """
+    Raise if any of the named environment variables (all of them by default) was missing at import
+    """
+    missing = [name for name in (names or _REQUIRED_SETTINGS) if name in _MISSING_SETTINGS]
+    if missing:
+        raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+
+# **************************************************************
+# Credentials and clients are created once per worker process and
+# reused by warm invocations, so their connection pools and cached
+# tokens survive from one request to the next
+# **************************************************************
+_clients_lock = threading.Lock()
+_credential = None
+_cu_token_provider = None
+_blob_service_clients = {}
+_container_clients = {}
+
+def _get_credential():
+    """
+    Return the shared credential, created on first use: the service principal
+    from the environment when it is configured, otherwise the managed identity
+    """
+    global _credential
+    if _credential is None:
+        with _clients_lock:
+            if _credential is None:
+                _credential = DefaultAzureCredential(exclude_interactive_browser_credential=True)
+    return _credential
+
+def _get_blob_service_client(storage_account_url):
+    """
+    Return the shared BlobServiceClient for a storage account url, created on first use
+    """
+    blob_service_client = _blob_service_clients.get(storage_account_url)
+    if blob_service_client is None:
+        credential = _get_credential()
+        with _clients_lock:
+            blob_service_client = _blob_service_clients.get(storage_account_url)
+            if blob_service_client is None:
+                blob_service_client = BlobServiceClient(account_url=storage_account_url, credential=credential)
+                _blob_service_clients[storage_account_url] = blob_service_client
+    return blob_service_client
+
+def _get_container_client(storage_account_url, container_name):
+    """
+    Return the shared ContainerClient for a container in a storage account, created on first use
+    """
+    container_client = _container_clients.get((storage_account_url, container_name))
+    if container_client is None:
+        blob_service_client = _get_blob_service_client(storage_account_url)
+        with _clients_lock:
+            container_client = _container_clients.get((storage_account_url, container_name))
+            if container_client is None:
+                container_client = blob_service_client.get_container_client(container_name)
+                _container_clients[(storage_account_url, container_name)] = container_client
+    return container_client
+
+def _get_content_understanding_client(endpoint, api_version):
+    """
+    Return the shared Content Understanding client; it asks the cached token provider
+    for a token on each request, so it stays authorized across warm invocations
+    """
+    global _cu_token_provider
+    if _cu_token_provider is None:
+        credential = _get_credential()
+        with _clients_lock:
+            if _cu_token_provider is None:
+                _cu_token_provider = get_bearer_token_provider(credential, "https://cognitiveservices.azure.com/.default")
+    return get_client(endpoint=endpoint, api_version=api_version, token_provider=_cu_token_provider)
+
 @app.route(route="perform_ocr", auth_level=func.AuthLevel.ANONYMOUS)
-def perform_ocr(req: func.HttpRequest) -> func.HttpResponse:
+async def perform_ocr(req: func.HttpRequest) -> func.HttpResponse:
     """
     Azure Function to perform OCR using Azure Content Understanding
     
@@ -33,7 +127,7 @@ def perform_ocr(req: func.HttpRequest) -> func.HttpResponse:
         # Try to get parameters from request body if not in query string
         if not all([classifier_id, blob_url, storage_account_name]):
             try:
-                req_body = req.get_json()
+                req_body = get_request_json(req)
                 if req_body:
                     classifier_id = classifier_id or req_body.get('classifier_id')
                     blob_url = blob_url or req_body.get('blob_url')
@@ -44,7 +138,7 @@ def perform_ocr(req: func.HttpRequest) -> func.HttpResponse:
         # Validate required parameters
         if not all([classifier_id, blob_url, storage_account_name]):
             return func.HttpResponse(
-                json.dumps({
+                orjson.dumps({
                     "error": "Missing required parameters",
                     "message": "classifier_id, blob_url, and storage_account_name are required"
                 }),
@@ -53,10 +147,10 @@ def perform_ocr(req: func.HttpRequest) -> func.HttpResponse:
             )
         
         # Call the OCR function
-        result = perform_ocr_processing(classifier_id, blob_url, storage_account_name)
+        result = await perform_ocr_processing(classifier_id, blob_url, storage_account_name)
         
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "success": True,
                 "message": "OCR processing completed successfully",
                 "result_blob_name": result.get("blob_name"),
@@ -69,7 +163,7 @@ def perform_ocr(req: func.HttpRequest) -> func.HttpResponse:
     except Exception as e:
         logging.error(f"Error in perform_ocr: {str(e)}")
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "success": False,
                 "error": str(e)
             }),
@@ -78,35 +172,19 @@ def perform_ocr(req: func.HttpRequest) -> func.HttpResponse:
         )
 
 
-def perform_ocr_processing(classifier_id: str, blob_url: str, storage_account_name: str) -> dict:
+async def classify_document(classifier_id: str, blob_url: str) -> dict:
     """
-    Core OCR processing function extracted from the original function
+    Classify and extract a document with Azure Content Understanding and return the OCR result JSON
+    Runs on the worker's event loop: the classify request and the polling
+    are awaited, so the worker can serve other invocations while waiting
     """
     
-    # Get configuration from environment variables
-    client_id = os.getenv("AZURE_CLIENT_ID")
-    client_secret = os.getenv("AZURE_CLIENT_SECRET")
-    tenant_id = os.getenv("AZURE_TENANT_ID")
-    endpoint = os.getenv("SERVICE_FOR_CU")
-    api_version = os.getenv("SERVICE_API_FOR_CU")
-    
-    # Validate environment variables
-    required_env_vars = [client_id, client_secret, tenant_id, endpoint, api_version]
-    if not all(required_env_vars):
-        raise ValueError("Missing required environment variables: AZURE_CLIENT_ID, AZURE_CLIENT_SECRET, AZURE_TENANT_ID, SERVICE_FOR_CU, SERVICE_API_FOR_CU")
+    # Validate the configuration read at import
+    _require_settings()
 
-    # Create the credential
-    credential = ClientSecretCredential(tenant_id, client_id, client_secret)
-    scope = "https://cognitiveservices.azure.com/.default" 
-    token_provider = get_bearer_token_provider(credential, "https://cognitiveservices.azure.com/.default")
-
-    # Initialize the Azure Content Understanding client
+    # Get the shared Azure Content Understanding client
     try:
-        content_understanding_client = AzureContentUnderstandingClient(
-            endpoint=endpoint,
-            api_version=api_version,
-            token_provider=token_provider,
-        )
+        content_understanding_client = _get_content_understanding_client(SERVICE_FOR_CU, SERVICE_API_FOR_CU)
         logging.info("✅ Content Understanding client initialized successfully!")
     except Exception as e:
         logging.error(f"❌ Failed to initialize client: {e}")
@@ -122,8 +200,11 @@ def perform_ocr_processing(classifier_id: str, blob_url: str, storage_account_na
             logging.info(f"   Document: {blob_url}")
             logging.info("\n⏳ Processing with classification + field extraction...")
 
-            response = content_understanding_client.begin_classify(classifier_id=classifier_id, file_location=blob_url)
-            ocr_result_json = content_understanding_client.poll_result(response, timeout_seconds=920, polling_interval_seconds=25)
+            response = await content_understanding_client.begin_classify_async(classifier_id=classifier_id, file_location=blob_url)
+            # poll after 1 second, backing off up to 10 seconds (or as long as Retry-After asks)
+            ocr_result_json = await content_understanding_client.poll_result_async(
+                response, timeout_seconds=920, polling_interval_seconds=1.0, max_polling_interval_seconds=10.0
+            )
             
             logging.info("\n✅ Processing completed!")
             
@@ -133,21 +214,45 @@ def perform_ocr_processing(classifier_id: str, blob_url: str, storage_account_na
     else:
         raise ValueError("⚠️ classifier does not exist.")
 
+    return ocr_result_json
+
+def make_ocr_result_blob_name(blob_url):
+    """
+    Build the OCR result blob name: orig PDF name + timestamp + .json
+    The excel and summary reports derive their names from it
+    """
+    original_file_name = os.path.basename(blob_url)
+    return f"{original_file_name}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+
+async def perform_ocr_processing(classifier_id: str, blob_url: str, storage_account_name: str) -> dict:
+    """
+    Core OCR processing function extracted from the original function
+    Classifies the document and uploads the OCR result JSON to the enhanced-results container
+    """
+    ocr_result_json = await classify_document(classifier_id, blob_url)
+
     # Upload results to blob storage
     storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
-    blob_service_client = BlobServiceClient(account_url=storage_account_url, credential=credential)
     container_name = "enhanced-results"
     
     # Generate result file name
-    original_file_name = os.path.basename(blob_url)
-    ocr_result_blob_name = f"{original_file_name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    ocr_result_blob_name = make_ocr_result_blob_name(blob_url)
 
-    # Convert the JSON object to a string
-    json_data = json.dumps(ocr_result_json)
+    # Serialize the JSON object straight to UTF-8 bytes
+    json_data = orjson.dumps(ocr_result_json)
 
     # get the ocr_result_json JSON from the blob storage
-    blob_client = blob_service_client.get_blob_client(container=container_name, blob=ocr_result_blob_name)
-    blob_client.upload_blob(json_data, overwrite=True)
+    blob_client = _get_container_client(storage_account_url, container_name).get_blob_client(ocr_result_blob_name)
+    # the blob client is synchronous, so upload from a worker thread to keep the event loop free
+    await asyncio.to_thread(
+        blob_client.upload_blob,
+        json_data,
+        blob_type=BlobType.BLOCKBLOB,
+        length=len(json_data),
+        content_settings=ContentSettings(content_type="application/json"),
+        overwrite=True,
+        max_concurrency=8,
+    )
     logging.info(f"Blob '{ocr_result_blob_name}' uploaded successfully to container '{container_name}'.")
     
     return {
@@ -155,6 +260,79 @@ def perform_ocr_processing(classifier_id: str, blob_url: str, storage_account_na
         "container_name": container_name
     }
 
+@app.route(route="perform_ocr_and_excel", auth_level=func.AuthLevel.ANONYMOUS)
+async def perform_ocr_and_excel(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Azure Function to perform OCR and create the excel report in one call
+    The OCR result stays in memory and is passed straight to the report,
+    so only the excel file is written to blob storage.
+    perform_ocr followed by create_excel remains available for the two-step flow
+    
+    Expected parameters:
+    - classifier_id: The classifier ID to use for document processing
+    - blob_url: URL of the blob to process
+    - storage_account_name: Name of the storage account for results
+    """
+    try:
+        # Get parameters from request
+        classifier_id = req.params.get('classifier_id')
+        blob_url = req.params.get('blob_url')
+        storage_account_name = req.params.get('storage_account_name')
+        
+        # Try to get parameters from request body if not in query string
+        if not all([classifier_id, blob_url, storage_account_name]):
+            try:
+                req_body = get_request_json(req)
+                if req_body:
+                    classifier_id = classifier_id or req_body.get('classifier_id')
+                    blob_url = blob_url or req_body.get('blob_url')
+                    storage_account_name = storage_account_name or req_body.get('storage_account_name')
+            except ValueError:
+                pass
+        
+        # Validate required parameters
+        if not all([classifier_id, blob_url, storage_account_name]):
+            return func.HttpResponse(
+                orjson.dumps({
+                    "error": "Missing required parameters",
+                    "message": "classifier_id, blob_url, and storage_account_name are required"
+                }),
+                status_code=400,
+                mimetype="application/json"
+            )
+        
+        # Run the OCR and hand the result straight to the excel report
+        ocr_result_json = await classify_document(classifier_id, blob_url)
+
+        # the report name is derived from the OCR result name, as in the two-step flow;
+        # building and uploading the workbook is blocking, so it runs on a worker thread
+        ocr_result_blob_name = make_ocr_result_blob_name(blob_url)
+        excel_result = await asyncio.to_thread(produce_excel_report, ocr_result_json, storage_account_name, ocr_result_blob_name)
+        if excel_result is None:
+            raise RuntimeError("Excel report could not be created or uploaded")
+
+        return func.HttpResponse(
+            orjson.dumps({
+                "success": True,
+                "message": "OCR processing and Excel File blob created successfully",
+                "result_blob_name": excel_result.get("blob_name"),
+                "container_name": excel_result.get("container_name")
+            }),
+            status_code=200,
+            mimetype="application/json"
+        )
+        
+    except Exception as e:
+        logging.error(f"Error in perform_ocr_and_excel: {str(e)}")
+        return func.HttpResponse(
+            orjson.dumps({
+                "success": False,
+                "error": str(e)
+            }),
+            status_code=500,
+            mimetype="application/json"
+        )
+
 @app.route(route="create_excel", auth_level=func.AuthLevel.ANONYMOUS)
 def create_excel(req: func.HttpRequest) -> func.HttpResponse:
     """
@@ -182,22 +360,13 @@ def create_excel(req: func.HttpRequest) -> func.HttpResponse:
         # storage account is same for source and target
         storage_account_name = req.params.get('storage_account_name')
 
-        # Get configuration from environment variables
-        client_id = os.getenv("AZURE_CLIENT_ID")
-        client_secret = os.getenv("AZURE_CLIENT_SECRET")
-        tenant_id = os.getenv("AZURE_TENANT_ID")
-        credential = ClientSecretCredential(tenant_id, client_id, client_secret)
-
-        # this is the url of the storage account
+        # the OCR results container in the storage account
         ocr_results_container_name = "enhanced-results"
-        storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
-
-        ocr_result_blob_url = storage_account_url + "/" + ocr_results_container_name + "/" + ocr_result_blob_name
 
         # Try to get parameters from request body if not in query string
         if not all([ocr_result_blob_name, storage_account_name]):
             try:
-                req_body = req.get_json()
+                req_body = get_request_json(req)
                 if req_body:
                     ocr_result_blob_name = ocr_result_blob_name or req_body.get('ocr_result_blob_name')
                     storage_account_name = storage_account_name or req_body.get('storage_account_name')
@@ -207,35 +376,41 @@ def create_excel(req: func.HttpRequest) -> func.HttpResponse:
         # Validate required parameters
         if not all([ocr_result_blob_name, storage_account_name]):
             return func.HttpResponse(
-                json.dumps({
+                orjson.dumps({
                     "error": "Missing required parameters",
                     "message": "ocr_result_blob_name and storage_account_name are required",
                     "received": {
-                        "req": req                    
+                        "ocr_result_blob_name": ocr_result_blob_name,
+                        "storage_account_name": storage_account_name
                     }
                 }),
                 status_code=400,
                 mimetype="application/json"
             )
+
+        # this is the url of the storage account, built once the parameters are final
+        storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
+
         # Get the enhanced result from the blob url and the enhance_results container
         
-        ocr_blob_service_client = BlobServiceClient(account_url=storage_account_url, credential=credential)
+        ocr_results_container_client = _get_container_client(storage_account_url, ocr_results_container_name)
 
         # Get the BlobClient for the specific blob
-        blob_client = ocr_blob_service_client.get_blob_client(container=ocr_results_container_name, blob=ocr_result_blob_name)
+        blob_client = ocr_results_container_client.get_blob_client(ocr_result_blob_name)
 
-        # Download the blob content into a variable and parse as JSON
-        blob_content = blob_client.download_blob().readall()
-        ocr_result_json = json.loads(blob_content.decode('utf-8'))
+        # Download the blob content and parse as JSON
+        ocr_result_json = download_json_blob(blob_client)
         
         print("starting excel")
 
         # Call the create_excel function to produce the report content
         excel_file_content = produce_excel_report(ocr_result_json, storage_account_name, ocr_result_blob_name)
+        if excel_file_content is None:
+            raise RuntimeError("Excel report could not be created or uploaded")
 
         # return success to the caller
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "success": True,
                 "message": "Excel File blob created successfully",
                 "result_blob_name": excel_file_content.get("excel_blob_name"),
@@ -249,7 +424,7 @@ def create_excel(req: func.HttpRequest) -> func.HttpResponse:
     except Exception as e:
         logging.error(f"Error in create_excel: {str(e)}")
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "success": False,
                 "error": str(e),
                 "storage_account_name": storage_account_name,
@@ -259,6 +434,96 @@ def create_excel(req: func.HttpRequest) -> func.HttpResponse:
             mimetype="application/json"
         )
     
+class _PreallocatedWriter(RawIOBase):
+    """
+    Seekable write-only stream over a bytearray sized up front, so a parallel
+    download writes each range in place instead of growing a buffer
+    """
+    def __init__(self, size):
+        super().__init__()
+        self.buffer = bytearray(size)
+        self._view = memoryview(self.buffer)
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += len(self.buffer)
+        self._position = offset
+        return offset
+
+    def write(self, data):
+        end = self._position + len(data)
+        self._view[self._position:end] = data
+        self._position = end
+        return len(data)
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+def download_json_blob(blob_client):
+    """
+    Download a JSON blob with parallel range reads straight into one buffer
+    and parse it in place, without an intermediate bytes or str copy.
+    The buffer is allocated once from the size the first response reports
+    """
+    downloader = blob_client.download_blob(max_concurrency=8)
+    with _PreallocatedWriter(downloader.size) as writer:
+        downloader.readinto(writer)
+        buffer = writer.buffer
+    return orjson.loads(buffer)
+
+# Copy Blob From URL completes in one call but only for sources up to 256 MiB
+MAX_SYNC_COPY_BYTES = 256 * 1024 * 1024
+
+def copy_blob_server_side(source_blob_client, target_blob_client, timeout_seconds=600):
+    """
+    Copy a blob inside Azure Storage without downloading it.
+    Sources up to 256 MiB use the synchronous copy, authorized with the service
+    principal token; larger ones start an asynchronous copy and poll it until it finishes.
+    Raises RuntimeError if the copy does not succeed
+    """
+    source_size = source_blob_client.get_blob_properties().size
+    if source_size <= MAX_SYNC_COPY_BYTES:
+        storage_token = _get_credential().get_token("https://storage.azure.com/.default").token
+        copy_result = target_blob_client.start_copy_from_url(
+            source_blob_client.url,
+            requires_sync=True,
+            source_authorization=f"Bearer {storage_token}",
+        )
+        copy_status = copy_result.get('copy_status')
+    else:
+        copy_status = target_blob_client.start_copy_from_url(source_blob_client.url).get('copy_status')
+        deadline = time.monotonic() + timeout_seconds
+        delay = 0.5
+        while copy_status == 'pending' and time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+            copy_status = target_blob_client.get_blob_properties().copy.status
+
+    if copy_status != 'success':
+        raise RuntimeError(f"Copy of blob '{source_blob_client.blob_name}' to '{target_blob_client.container_name}' did not complete: {copy_status}")
+
+def get_request_json(req):
+    """
+    Parse the request body with orjson, returning None when there is no body.
+    Only called when a parameter is missing from the query string, so
+    query-string-only requests never touch the body
+    """
+    body = req.get_body()
+    return orjson.loads(body) if body else None
+
 def determine_original_pdfs_name(blob_url):
     """
     Extract the original PDF file name from the blob URL.
@@ -268,135 +533,180 @@ def determine_original_pdfs_name(blob_url):
     import os
     return os.path.basename(blob_url).split('.')[0]
     
+# Shared defaults for OCR lookups of missing fields; read only, never mutated
+_EMPTY_DICT = {}
+_EMPTY_LIST = ()
+
+# Patient info keys used by the Excel report mapped to their OCR field names
+PATIENT_FIELDS = {
+    'first_name': 'Patient_First_Name',
+    'last_name': 'Patient_Last_Name',
+    'dob': 'DOB',
+    'gender': 'Gender',
+    'policy_number': 'Policy_Number',
+}
+PATIENT_KEYS = frozenset(PATIENT_FIELDS.values())
+
+# Expense columns B through J of the Excel report: (OCR field name, column header)
+EXPENSE_SCHEMA = (
+    ('Expense_Amount', 'Expense Amount'),
+    ('Expense_Description', 'Expense Description'),
+    ('Date', 'Date'),
+    ('CPT_Code', 'CPT Code'),
+    ('ICD_Code', 'ICD Code'),
+    ('Expense_Type', 'Expense Type'),
+    ('Surgeon_Name_or_Provider', 'Surgeon/Provider'),
+    ('Ref_Page', 'Ref Page'),
+    ('Drug_Name', 'Drug Name'),
+)
+
+def build_expense_row(expense_obj, start_offset):
+    """
+    Build the Excel row values for one expense in EXPENSE_SCHEMA order.
+    Every column is read as a string first, then the three typed columns are fixed up:
+    the amount is formatted as dollars, a typed date uses valueDate, and the referenced
+    page is made relative to the bundle using the document's start offset
+    (start page - 1, or None when the start page is unknown)
+    """
+    row = [expense_obj.get(name, _EMPTY_DICT).get('valueString', 'N/A') for name, _ in EXPENSE_SCHEMA]
+
+    # Expense Amount
+    amount_field = expense_obj.get('Expense_Amount', _EMPTY_DICT)
+    if amount_field.get('type') == 'number':
+        row[0] = f"${amount_field.get('valueNumber', 0):.2f}"
+    else:
+        row[0] = 'N/A'
+
+    # Date
+    date_field = expense_obj.get('Date', _EMPTY_DICT)
+    if date_field.get('type') == 'date':
+        row[2] = date_field.get('valueDate', 'N/A')
+
+    # Ref Page
+    ref_field = expense_obj.get('Ref_Page', _EMPTY_DICT)
+    if ref_field.get('type') == 'number':
+        ref_page = ref_field.get('valueNumber', 0)
+        # Adjust page number relative to document start
+        row[7] = int(ref_page) + start_offset if start_offset is not None else ref_page
+    else:
+        row[7] = 'N/A'
+
+    return row
+
 def produce_excel_report(ocr_result_json, storage_account_name, ocr_blob_name):
     """
     Create an Excel report from the ocr_result_json data with patient info, 
     document listings, and collapsible expense rows.
     and writes the report to a blob file in Azure storage
-    Returns the blob name and container name of the uploaded excel file
+    Returns the blob name and container name of the uploaded excel file,
+    or None if the report could not be created or uploaded
     """
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-    from datetime import datetime
-    import os
-
-    # Get configuration from environment variables
-    client_id = os.getenv("AZURE_CLIENT_ID")
-    client_secret = os.getenv("AZURE_CLIENT_SECRET")
-    tenant_id = os.getenv("AZURE_TENANT_ID")
-
-    # the credential should be a service account
-    credential = ClientSecretCredential(tenant_id, client_id, client_secret)
+    import xlsxwriter
 
     try:
         # data is the output from the OCR step
         print("📊 Creating Excel Report")
         print("=" * 50)
         
-        ocr_result_data = ocr_result_json.get("result", {})
-        ocr_contents = ocr_result_data.get("contents", [])
+        ocr_result_data = ocr_result_json.get("result", _EMPTY_DICT)
+        ocr_contents = ocr_result_data.get("contents", _EMPTY_LIST)
 
         if not ocr_contents:
             print("❌ No data to export")
             return None
         
         # Create workbook and worksheet
-        # the output from this is the wb object
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Claims Analysis Report"
+        # constant_memory writes each row out as soon as the next one starts,
+        # so rows must be written top to bottom and memory stays flat
+        output = BytesIO()
+        wb = xlsxwriter.Workbook(output, {'constant_memory': True, 'strings_to_urls': False})
+        ws = wb.add_worksheet("Claims Analysis Report")
         
-        # Define styles
-        header_font = Font(bold=True, size=12)
-        subheader_font = Font(bold=True, size=10)
-        normal_font = Font(size=10)
-        patient_fill = PatternFill(start_color="E6F3FF", end_color="E6F3FF", fill_type="solid")
-        doc_fill = PatternFill(start_color="F0F8FF", end_color="F0F8FF", fill_type="solid")
-        expense_fill = PatternFill(start_color="FFF8DC", end_color="FFF8DC", fill_type="solid")
-        
-        # Borders
-        thin_border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-        
-        current_row = 1
+        # Define styles (each distinct combination is a format, created once and reused)
+        header_font = {'bold': True, 'font_size': 12}
+        subheader_font = {'bold': True, 'font_size': 10}
+        normal_font = {'font_size': 10}
+        patient_fill = {'pattern': 1, 'bg_color': '#E6F3FF', 'border': 1}
+        doc_fill = {'pattern': 1, 'bg_color': '#F0F8FF', 'border': 1}
+        expense_fill = {'pattern': 1, 'bg_color': '#FFF8DC', 'border': 1}
+        center = {'align': 'center'}
+
+        patient_title_fmt = wb.add_format({**header_font, **center, **patient_fill})
+        patient_label_fmt = wb.add_format({**subheader_font, **patient_fill})
+        patient_value_fmt = wb.add_format({**normal_font, **patient_fill})
+        patient_blank_fmt = wb.add_format(patient_fill)
+        section_title_fmt = wb.add_format({**header_font, **center})
+        doc_header_fmt = wb.add_format({**subheader_font, **doc_fill})
+        doc_header_center_fmt = wb.add_format({**subheader_font, **doc_fill, **center})
+        doc_value_fmt = wb.add_format({**normal_font, **doc_fill})
+        doc_value_center_fmt = wb.add_format({**normal_font, **doc_fill, **center})
+        doc_blank_fmt = wb.add_format(doc_fill)
+        expense_header_fmt = wb.add_format({**subheader_font, **expense_fill})
+        expense_value_fmt = wb.add_format({**normal_font, **expense_fill})
+
+        # Longest value written to each column A through J, for the column widths
+        # (merged title rows are not counted)
+        col_max = [0] * 10
+
+        def write(row, col, value, cell_format):
+            ws.write(row, col, value, cell_format)
+            if value:
+                col_max[col] = max(col_max[col], len(str(value)))
+
+        # xlsxwriter rows and columns are zero based: row 0 is Excel row 1, column 0 is A
+        current_row = 0
         
         # Extract patient information from claim form (first document that has patient info)
         patient_info = {}
         for content in ocr_contents:
-            fields = content.get('fields', {})
-            if any(field in fields for field in ['Patient_First_Name', 'Patient_Last_Name', 'DOB', 'Gender', 'Policy_Number']):
-                patient_info = {
-                    'first_name': fields.get('Patient_First_Name', {}).get('valueString', ''),
-                    'last_name': fields.get('Patient_Last_Name', {}).get('valueString', ''),
-                    'dob': fields.get('DOB', {}).get('valueString', ''),
-                    'gender': fields.get('Gender', {}).get('valueString', ''),
-                    'policy_number': fields.get('Policy_Number', {}).get('valueString', '')
-                }
+            fields = content.get('fields', _EMPTY_DICT)
+            if PATIENT_KEYS & fields.keys():
+                patient_info = {key: fields.get(name, _EMPTY_DICT).get('valueString', '') for key, name in PATIENT_FIELDS.items()}
                 break
         
-        # Patient Information Section
-        ws.merge_cells(f'A{current_row}:I{current_row}')
-        ws[f'A{current_row}'] = "PATIENT INFORMATION"
-        ws[f'A{current_row}'].font = header_font
-        ws[f'A{current_row}'].alignment = Alignment(horizontal='center')
+        # Patient Information Section (the whole block A through J is filled and bordered)
+        ws.merge_range(current_row, 0, current_row, 8, "PATIENT INFORMATION", patient_title_fmt)
+        ws.write_blank(current_row, 9, None, patient_blank_fmt)
         current_row += 1
         
         # Patient Name row
         patient_name = f"{patient_info.get('first_name', '')} {patient_info.get('last_name', '')}".strip()
-        ws[f'A{current_row}'] = "Patient Name:"
-        ws[f'B{current_row}'] = patient_name
-        ws[f'A{current_row}'].font = subheader_font
-        ws[f'B{current_row}'].font = normal_font
+        write(current_row, 0, "Patient Name:", patient_label_fmt)
+        write(current_row, 1, patient_name, patient_value_fmt)
+        for col in range(2, 10):
+            ws.write_blank(current_row, col, None, patient_blank_fmt)
         current_row += 1
         
-        # Patient details headers
-        ws[f'A{current_row}'] = "DOB"
-        ws[f'C{current_row}'] = "Gender"
-        ws[f'E{current_row}'] = "Policy Number"
-        for col in ['A', 'C', 'E']:
-            ws[f'{col}{current_row}'].font = subheader_font
+        # Patient details headers and values in columns A, C and E
+        patient_details = [
+            ("DOB", patient_info.get('dob', '')),
+            ("Gender", patient_info.get('gender', '')),
+            ("Policy Number", patient_info.get('policy_number', '')),
+        ]
+        for col, (label, _) in zip((0, 2, 4), patient_details):
+            write(current_row, col, label, patient_label_fmt)
+        for col in (1, 3, 5, 6, 7, 8, 9):
+            ws.write_blank(current_row, col, None, patient_blank_fmt)
         current_row += 1
-        
-        # Patient details values
-        ws[f'A{current_row}'] = patient_info.get('dob', '')
-        ws[f'C{current_row}'] = patient_info.get('gender', '')
-        ws[f'E{current_row}'] = patient_info.get('policy_number', '')
-        for col in ['A', 'C', 'E']:
-            ws[f'{col}{current_row}'].font = normal_font
-        
-        # Apply patient info styling
-        for row in range(1, current_row + 1):
-            for col in range(1, 11):  # A to I
-                cell = ws.cell(row=row, column=col)
-                cell.fill = patient_fill
-                cell.border = thin_border
+        for col, (_, value) in zip((0, 2, 4), patient_details):
+            write(current_row, col, value, patient_value_fmt)
+        for col in (1, 3, 5, 6, 7, 8, 9):
+            ws.write_blank(current_row, col, None, patient_blank_fmt)
         
         current_row += 3  # Add spacing
         
         # Document Section Header
-        ws.merge_cells(f'A{current_row}:I{current_row}')
-        ws[f'A{current_row}'] = "DOCUMENTS FOUND IN BUNDLE"
-        ws[f'A{current_row}'].font = header_font
-        ws[f'A{current_row}'].alignment = Alignment(horizontal='center')
+        ws.merge_range(current_row, 0, current_row, 8, "DOCUMENTS FOUND IN BUNDLE", section_title_fmt)
         current_row += 1
         
         # Document headers
         doc_headers = ['Document #', 'Title', 'Starting Page', 'Ending Page', 'Number of Pages']
-        for i, header in enumerate(doc_headers, 1):
-            ws.cell(row=current_row, column=i, value=header)
-            ws.cell(row=current_row, column=i).font = subheader_font
-            ws.cell(row=current_row, column=i).fill = doc_fill
-            ws.cell(row=current_row, column=i).border = thin_border
-
-        ws.cell(row=current_row, column=1).alignment = Alignment(horizontal='center')
+        for i, header in enumerate(doc_headers):
+            write(current_row, i, header, doc_header_center_fmt if i == 0 else doc_header_fmt)
         current_row += 1
         
         # Process each document
         for doc_num, content in enumerate(ocr_contents, 1):
-            doc_start_row = current_row
-            
             # Document basic info
             category = content.get('category', 'Unknown')
             start_page = content.get('startPageNumber', '?')
@@ -408,146 +718,56 @@ def produce_excel_report(ocr_result_json, storage_account_name, ocr_blob_name):
                 num_pages = '?'
             
             # Get document title
-            fields = content.get('fields', {})
+            fields = content.get('fields', _EMPTY_DICT)
             title = "N/A"
             if 'title_on_first_page_of_document' in fields:
                 title = fields['title_on_first_page_of_document'].get('valueString', 'N/A')
             
-            # Write document row
+            # Write document row (column A centered)
             doc_data = [doc_num, title, start_page, end_page, num_pages]
-            for i, value in enumerate(doc_data, 1):
-                ws.cell(row=current_row, column=i, value=value)
-                ws.cell(row=current_row, column=i).font = normal_font
-                ws.cell(row=current_row, column=i).fill = doc_fill
-                ws.cell(row=current_row, column=i).border = thin_border
-            
-            # Extend document row background color to column k (10) to line up with expense columns
-            for col in range(6, 11):  # Columns F through k
-                ws.cell(row=current_row, column=col).fill = doc_fill
-                ws.cell(row=current_row, column=col).border = thin_border
+            for i, value in enumerate(doc_data):
+                write(current_row, i, value, doc_value_center_fmt if i == 0 else doc_value_fmt)
             
-            # center column A
-            ws.cell(row=current_row, column=1).alignment = Alignment(horizontal='center')
+            # Extend document row background color to column J to line up with expense columns
+            for col in range(5, 10):  # Columns F through J
+                ws.write_blank(current_row, col, None, doc_blank_fmt)
 
             current_row += 1
             
             # Check for expenses
-            if 'Expenses' in fields:
-                expenses = fields['Expenses'].get('valueArray', [])
-                if expenses:
-                    # Expense headers (starting from column B, leaving A empty)
-                    expense_headers = [
-                        'Expense Amount', 'Expense Description', 'Date', 'CPT Code',
-                        'ICD Code', 'Expense Type', 'Surgeon/Provider', 'Ref Page', 'Drug Name'
-                    ]
+            expenses = fields.get('Expenses', _EMPTY_DICT).get('valueArray', _EMPTY_LIST)
+            if expenses:
+                # Expense header and expense rows form a collapsed outline group
+                ws.set_row(current_row, None, None, {'level': 1, 'hidden': True})
+                for i, (_, header) in enumerate(EXPENSE_SCHEMA, 1):  # Start from column B (1)
+                    write(current_row, i, header, expense_header_fmt)
+                
+                current_row += 1
+                
+                # Ref pages are relative to the document, so shift them by its start page once per document
+                start_offset = start_page - 1 if isinstance(start_page, int) else None
+
+                # Process expenses
+                for expense in expenses:
+                    expense_data = build_expense_row(expense.get('valueObject', _EMPTY_DICT), start_offset)
                     
-                    for i, header in enumerate(expense_headers, 2):  # Start from column B (2)
-                        ws.cell(row=current_row, column=i, value=header)
-                        ws.cell(row=current_row, column=i).font = subheader_font
-                        ws.cell(row=current_row, column=i).fill = expense_fill
-                        ws.cell(row=current_row, column=i).border = thin_border
+                    # Write expense row (starting from column B, leaving A empty)
+                    ws.set_row(current_row, None, None, {'level': 1, 'hidden': True})
+                    ws.write_row(current_row, 1, expense_data, expense_value_fmt)
+                    for col, value in enumerate(expense_data, 1):
+                        if value:
+                            col_max[col] = max(col_max[col], len(str(value)))
                     
-                    expense_start_row = current_row
                     current_row += 1
-                    
-                    # Process expenses
-                    for expense in expenses:
-                        expense_obj = expense.get('valueObject', {})
-                        
-                        # Extract expense data
-                        expense_data = []
-                        
-                        # Expense Amount
-                        amount_field = expense_obj.get('Expense_Amount', {})
-                        if amount_field.get('type') == 'number':
-                            amount = amount_field.get('valueNumber', 0)
-                            expense_data.append(f"${amount:.2f}")
-                        else:
-                            expense_data.append('N/A')
-                        
-                        # Description
-                        desc_field = expense_obj.get('Expense_Description', {})
-                        expense_data.append(desc_field.get('valueString', 'N/A'))
-                        
-                        # Date
-                        date_field = expense_obj.get('Date', {})
-                        if date_field.get('type') == 'date':
-                            expense_data.append(date_field.get('valueDate', 'N/A'))
-                        else:
-                            expense_data.append(date_field.get('valueString', 'N/A'))
-                        
-                        # CPT Code
-                        cpt_field = expense_obj.get('CPT_Code', {})
-                        expense_data.append(cpt_field.get('valueString', 'N/A'))
-                        
-                        # ICD Code
-                        icd_field = expense_obj.get('ICD_Code', {})
-                        expense_data.append(icd_field.get('valueString', 'N/A'))
-                        
-                        # Expense Type
-                        type_field = expense_obj.get('Expense_Type', {})
-                        expense_data.append(type_field.get('valueString', 'N/A'))
-                        
-                        # Surgeon/Provider
-                        surgeon_field = expense_obj.get('Surgeon_Name_or_Provider', {})
-                        expense_data.append(surgeon_field.get('valueString', 'N/A'))
-                        
-                        # Ref Page
-                        ref_field = expense_obj.get('Ref_Page', {})
-                        if ref_field.get('type') == 'number':
-                            ref_page = ref_field.get('valueNumber', 0)
-                            # Adjust page number relative to document start
-                            adjusted_page = int(ref_page) + start_page - 1 if start_page != '?' else ref_page
-                            expense_data.append(adjusted_page)
-                        else:
-                            expense_data.append('N/A')
-                        
-                        # Drug Name
-                        drug_field = expense_obj.get('Drug_Name', {})
-                        expense_data.append(drug_field.get('valueString', 'N/A'))
-                        
-                        # Write expense row (starting from column B, leaving A empty)
-                        for i, value in enumerate(expense_data, 2):  # Start from column B (2)
-                            ws.cell(row=current_row, column=i, value=value)
-                            ws.cell(row=current_row, column=i).font = normal_font
-                            ws.cell(row=current_row, column=i).fill = expense_fill
-                            ws.cell(row=current_row, column=i).border = thin_border
-                        
-                        current_row += 1
-                    
-                    # Create collapsible group for expenses (including header and expense rows)
-                    if current_row > expense_start_row + 1:
-                        ws.row_dimensions.group(expense_start_row, current_row - 1, hidden=True)
             
             current_row += 1  # Add spacing between documents
         
-        # Auto-size columns (simplified approach to avoid merged cell issues)
-        for col_num in range(1, 11):  # Columns A through J
-            max_length = 0
-            column_letter = openpyxl.utils.get_column_letter(col_num)
-            
-            # Iterate through all rows for this column
-            for row_num in range(1, current_row):
-                cell = ws.cell(row=row_num, column=col_num)
-                
-                # Skip merged cells to avoid conflicts
-                is_merged = False
-                for merged_range in ws.merged_cells.ranges:
-                    if cell.coordinate in merged_range:
-                        is_merged = True
-                        break
-                
-                # Only calculate length for non-merged cells with values
-                if not is_merged and cell.value:
-                    cell_length = len(str(cell.value))
-                    max_length = max(max_length, cell_length)
-            
-            # Set column width (cap at 50 characters for readability)
-            adjusted_width = min(max_length + 2, 50) if max_length > 0 else 15
-            ws.column_dimensions[column_letter].width = adjusted_width
-            # Save the workbook
-            output = BytesIO()
-            wb.save(output)
+        # Size columns from the lengths tracked while writing (cap at 50 characters for readability)
+        for col, max_length in enumerate(col_max):
+            ws.set_column(col, col, min(max_length + 2, 50) if max_length > 0 else 15)
+
+        # Save the workbook
+        wb.close()
         
     except Exception as e:
             print(f"❌ Error creating Excel report: {e}")
@@ -567,18 +787,24 @@ def produce_excel_report(ocr_result_json, storage_account_name, ocr_blob_name):
         # same storage account url as before
         storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
 
-        # The excel blob url includes the excel_blob name
-        excel_blob_url = storage_account_url + "/" + excel_container_name + "/" + excel_blob_name
-        excel_blob_service_client = BlobServiceClient(account_url=storage_account_url, credential=credential)
-        # use the blob service client to get a blob client
-        excel_blob_client = excel_blob_service_client.get_blob_client(container=excel_container_name, blob=excel_blob_name)
+        # use the shared container client to get a blob client
+        excel_blob_client = _get_container_client(storage_account_url, excel_container_name).get_blob_client(excel_blob_name)
 
         # ***************************************************
         # Upload the excel report content file to the excel
         # container blob storage.
-        # output.getvalue() contains the contents of the excel file
+        # output is streamed from the start so the SDK reads the
+        # workbook in chunks without copying it into a new bytes
         # ***************************************************
-        excel_blob_client.upload_blob(output.getvalue(), overwrite=True)
+        output.seek(0)
+        excel_blob_client.upload_blob(
+            output,
+            blob_type=BlobType.BLOCKBLOB,
+            length=output.getbuffer().nbytes,
+            content_settings=ContentSettings(content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+            overwrite=True,
+            max_concurrency=8,
+        )
 
         # log it
         logging.info(f"Blob '{excel_blob_name}' uploaded successfully to excel container '{excel_container_name}'.")
@@ -595,21 +821,14 @@ def produce_excel_report(ocr_result_json, storage_account_name, ocr_blob_name):
         logging.info(f" The target excel container_name was {excel_container_name}")
         logging.info(f" The blob name was {excel_blob_name}")
 
-        # if there was an error, return what we know
-        if excel_blob_name is None:
-            excel_blob_name = "unknown_due_to_error"
-        if excel_container_name is None:
-            excel_container_name = "unknown_due_to_error"
-        return {
-            "blob_name": excel_blob_name,
-            "container_name": excel_container_name
-        }
+        # the report never reached the excel container, so callers must not report it as created
+        return None
 
     # to test the create excel
     # http://localhost:7071/api/create_excel?ocr_result_blob_name=%22https://wwawilkdemostow.blob.core.windows.net/incoming-docs/sample%20claim%20submission.pdf_20251016_111305.json%22&storage_account_name=%22wwawilkdemostow%22
 
 @app.route(route="clean_up", auth_level=func.AuthLevel.ANONYMOUS)
-def clean_up(req: func.HttpRequest) -> func.HttpResponse:
+async def clean_up(req: func.HttpRequest) -> func.HttpResponse:
     """
     Azure Function to perform clean up of blob in containers
     This function should move the blob that is in the incoming-docs container
@@ -625,22 +844,13 @@ def clean_up(req: func.HttpRequest) -> func.HttpResponse:
     # storage account is same for source and target
     storage_account_name = req.params.get('storage_account_name')
 
-    # Get configuration from environment variables
-    client_id = os.getenv("AZURE_CLIENT_ID")
-    client_secret = os.getenv("AZURE_CLIENT_SECRET")
-    tenant_id = os.getenv("AZURE_TENANT_ID")
-    credential = ClientSecretCredential(tenant_id, client_id, client_secret)
-
-    # this is the url of the storage account
+    # the incoming docs container in the storage account
     incoming_docs_container_name = "incoming-docs"
-    storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
-
-    incoming_docs_blob_url = storage_account_url + "/" + incoming_docs_container_name + "/" + incoming_docs_blob_name
 
     # Try to get parameters from request body if not in query string
     if not all([incoming_docs_blob_name, storage_account_name]):
         try:
-            req_body = req.get_json()
+            req_body = get_request_json(req)
             if req_body:
                 incoming_docs_blob_name = incoming_docs_blob_name or req_body.get('incoming_docs_blob_name')
                 storage_account_name = storage_account_name or req_body.get('storage_account_name')
@@ -650,40 +860,40 @@ def clean_up(req: func.HttpRequest) -> func.HttpResponse:
     # Validate required parameters
     if not all([incoming_docs_blob_name, storage_account_name]):
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "error": "Missing required parameters",
                 "message": "incoming_docs_blob_name and storage_account_name are required",
                 "received": {
-                    "req": req                    
+                    "incoming_docs_blob_name": incoming_docs_blob_name,
+                    "storage_account_name": storage_account_name
                 }
             }),
             status_code=400,
             mimetype="application/json"
         )
+
+    # this is the url of the storage account, built once the parameters are final
+    storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
+
     # we are getting the PDF from incoming docs and putting into the processed-docs container
     # before we delete it from incoming docs
     try:
         logging.info(f"🔄 Cleaning up blob: {incoming_docs_blob_name} from {incoming_docs_container_name} container")
-        incoming_docs_blob_service_client = BlobServiceClient(account_url=storage_account_url, credential=credential)
-        processed_docs_blob_service_client = BlobServiceClient(account_url=storage_account_url, credential=credential)
-        
         # Get the BlobClient for the specific blob
-        incoming_docs_blob_client = incoming_docs_blob_service_client.get_blob_client(container=incoming_docs_container_name, blob=incoming_docs_blob_name)
-
-        # get the blob from the client above incoming_docs_blob_client
-        incoming_docs_blob = incoming_docs_blob_client.download_blob().readall()
+        incoming_docs_blob_client = _get_container_client(storage_account_url, incoming_docs_container_name).get_blob_client(incoming_docs_blob_name)
 
-        # write it out first before deleting
-        processed_docs_blob_client = processed_docs_blob_service_client.get_blob_client(container="processed-docs", blob=incoming_docs_blob_name)
-        processed_docs_blob_client.upload_blob(incoming_docs_blob, overwrite=True)
-        logging.info(f"Blob '{incoming_docs_blob_name}' uploaded successfully to container 'processed-docs'.")
+        # copy it server side first before deleting, so the bytes never pass through the worker
+        processed_docs_blob_client = _get_container_client(storage_account_url, "processed-docs").get_blob_client(incoming_docs_blob_name)
+        # the blob clients are synchronous, so storage calls run on worker threads to keep the event loop free
+        await asyncio.to_thread(copy_blob_server_side, incoming_docs_blob_client, processed_docs_blob_client)
+        logging.info(f"Blob '{incoming_docs_blob_name}' copied successfully to container 'processed-docs'.")
 
         # Delete the blob from incoming -docs container
-        incoming_docs_blob_client.delete_blob()
+        await asyncio.to_thread(incoming_docs_blob_client.delete_blob)
         logging.info(f"Blob '{incoming_docs_blob_name}' deleted successfully from container {incoming_docs_container_name}.")
 
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "success": True,
                 "message": f"Blob '{incoming_docs_blob_name}' cleaned up successfully from container {incoming_docs_container_name}."
             }),
@@ -693,7 +903,7 @@ def clean_up(req: func.HttpRequest) -> func.HttpResponse:
     except Exception as e:
         logging.error(f"Error in clean_up: {str(e)}")
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "success": False,
                 "error": str(e)
             }),
@@ -702,8 +912,110 @@ def clean_up(req: func.HttpRequest) -> func.HttpResponse:
         )
     # we can test with curl -G "https://fat-1488137190.azurewebsites.net/api/clean_up" --data-urlencode "incoming_docs_blob_name=sample claim submission.pdf"  --data-urlencode "storage_account_name=wwawilkdemostow"
 
+# the blob batch API accepts at most 256 sub-requests per call
+MAX_BATCH_DELETES = 256
+
+@app.route(route="clean_up_batch", auth_level=func.AuthLevel.ANONYMOUS)
+async def clean_up_batch(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Azure Function to clean up several blobs in one call
+    Each blob is copied server side from the incoming-docs container to the
+    processed-docs container, concurrently, and the copied blobs are then
+    deleted from incoming-docs with batch requests instead of one DELETE each
+    
+    Expected parameters (request body):
+    - blob_names: list of blob names in the incoming-docs container
+    - storage_account_name: Name of the storage account (may also be in the query string)
+    """
+    storage_account_name = req.params.get('storage_account_name')
+    blob_names = None
+    try:
+        req_body = get_request_json(req)
+        if req_body:
+            blob_names = req_body.get('blob_names')
+            storage_account_name = storage_account_name or req_body.get('storage_account_name')
+    except ValueError:
+        pass
+
+    # Validate required parameters
+    if (
+        not blob_names
+        or not isinstance(blob_names, list)
+        or not all(isinstance(blob_name, str) and blob_name for blob_name in blob_names)
+        or not storage_account_name
+    ):
+        return func.HttpResponse(
+            orjson.dumps({
+                "error": "Missing required parameters",
+                "message": "blob_names (a non-empty list of blob names) and storage_account_name are required"
+            }),
+            status_code=400,
+            mimetype="application/json"
+        )
+
+    # a name listed twice would be copied twice and its second delete would fail with 404
+    blob_names = list(dict.fromkeys(blob_names))
+
+    incoming_docs_container_name = "incoming-docs"
+    storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
+
+    try:
+        logging.info(f"🔄 Cleaning up {len(blob_names)} blobs from {incoming_docs_container_name} container")
+        incoming_docs_container_client = _get_container_client(storage_account_url, incoming_docs_container_name)
+        processed_docs_container_client = _get_container_client(storage_account_url, "processed-docs")
+
+        # copy every blob server side at the same time; the blob clients are synchronous, so each copy runs on a worker thread
+        copy_results = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    copy_blob_server_side,
+                    incoming_docs_container_client.get_blob_client(blob_name),
+                    processed_docs_container_client.get_blob_client(blob_name),
+                )
+                for blob_name in blob_names
+            ),
+            return_exceptions=True,
+        )
+        copied = [blob_name for blob_name, result in zip(blob_names, copy_results) if not isinstance(result, Exception)]
+        failed = {blob_name: str(result) for blob_name, result in zip(blob_names, copy_results) if isinstance(result, Exception)}
+
+        # only blobs that reached processed-docs are deleted, up to 256 per batch request;
+        # a failed sub-delete is reported per blob instead of failing the whole route
+        cleaned_up = []
+        for start in range(0, len(copied), MAX_BATCH_DELETES):
+            batch = copied[start:start + MAX_BATCH_DELETES]
+            delete_responses = await asyncio.to_thread(
+                incoming_docs_container_client.delete_blobs, *batch, raise_on_any_failure=False
+            )
+            for blob_name, delete_response in zip(batch, delete_responses):
+                if delete_response.status_code >= 300:
+                    failed[blob_name] = f"Copied to 'processed-docs' but delete from '{incoming_docs_container_name}' failed with status {delete_response.status_code}"
+                else:
+                    cleaned_up.append(blob_name)
+        logging.info(f"{len(cleaned_up)} blobs moved to container 'processed-docs', {len(failed)} failed.")
+
+        return func.HttpResponse(
+            orjson.dumps({
+                "success": not failed,
+                "cleaned_up": cleaned_up,
+                "failed": failed
+            }),
+            status_code=200 if not failed else 207,
+            mimetype="application/json"
+        )
+    except Exception as e:
+        logging.error(f"Error in clean_up_batch: {str(e)}")
+        return func.HttpResponse(
+            orjson.dumps({
+                "success": False,
+                "error": str(e)
+            }),
+            status_code=500,
+            mimetype="application/json"
+        )
+
 @app.route(route="parse_ocr", auth_level=func.AuthLevel.ANONYMOUS)
-def parse_ocr(req: func.HttpRequest) -> func.HttpResponse:
+async def parse_ocr(req: func.HttpRequest) -> func.HttpResponse:
     """
     Azure Function to create a summary report from content 
     in the OCR results blob (same storage account, different container)
@@ -711,6 +1023,9 @@ def parse_ocr(req: func.HttpRequest) -> func.HttpResponse:
     - ocr_result_blob_name: The name of the JSON blob to process
     - storage_account_name: Name of the storage account for results
     """
+    # bound before anything can fail, so the error response below can always use them
+    storage_account_name = None
+    summary_report_blob_name = None
     try:
         # **************************************************************
         # the format for the blob names is as follows
@@ -730,22 +1045,13 @@ def parse_ocr(req: func.HttpRequest) -> func.HttpResponse:
         # storage account is same for source and target
         storage_account_name = req.params.get('storage_account_name')
 
-        # Get configuration from environment variables
-        client_id = os.getenv("AZURE_CLIENT_ID")
-        client_secret = os.getenv("AZURE_CLIENT_SECRET")
-        tenant_id = os.getenv("AZURE_TENANT_ID")
-        credential = ClientSecretCredential(tenant_id, client_id, client_secret)
-
-        # this is the url of the storage account
+        # the OCR results container in the storage account
         ocr_results_container_name = "enhanced-results"
-        storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
-
-        ocr_result_blob_url = storage_account_url + "/" + ocr_results_container_name + "/" + ocr_result_blob_name
 
         # Try to get parameters from request body if not in query string
         if not all([ocr_result_blob_name, storage_account_name]):
             try:
-                req_body = req.get_json()
+                req_body = get_request_json(req)
                 if req_body:
                     ocr_result_blob_name = ocr_result_blob_name or req_body.get('ocr_result_blob_name')
                     storage_account_name = storage_account_name or req_body.get('storage_account_name')
@@ -755,35 +1061,45 @@ def parse_ocr(req: func.HttpRequest) -> func.HttpResponse:
         # Validate required parameters
         if not all([ocr_result_blob_name, storage_account_name]):
             return func.HttpResponse(
-                json.dumps({
+                orjson.dumps({
                     "error": "Missing required parameters",
                     "message": "ocr_result_blob_name and storage_account_name are required",
                     "received": {
-                        "req": req                    
+                        "ocr_result_blob_name": ocr_result_blob_name,
+                        "storage_account_name": storage_account_name
                     }
                 }),
                 status_code=400,
                 mimetype="application/json"
             )
+
+        # this is the url of the storage account, built once the parameters are final
+        storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
+
         # Get the enhanced result from the blob url and the enhance_results container
         
-        ocr_blob_service_client = BlobServiceClient(account_url=storage_account_url, credential=credential)
+        ocr_results_container_client = _get_container_client(storage_account_url, ocr_results_container_name)
 
         # Get the BlobClient for the specific blob
-        blob_client = ocr_blob_service_client.get_blob_client(container=ocr_results_container_name, blob=ocr_result_blob_name)
+        blob_client = ocr_results_container_client.get_blob_client(ocr_result_blob_name)
 
-        # Download the blob content into a variable and parse as JSON
-        blob_content = blob_client.download_blob().readall()
-        ocr_result_json = json.loads(blob_content.decode('utf-8'))
+        # Download the blob content and parse it as JSON without decoding to str first;
+        # the blob clients are synchronous, so storage calls run on worker threads to keep the event loop free
+        ocr_result_json = await asyncio.to_thread(download_json_blob, blob_client)
         
         print("starting summary")
 
         # Call the create_summary function to produce the report content
-        summary_report_blob_name, summary_container_name = produce_summary_report(ocr_result_json, storage_account_name, ocr_result_blob_name, credential)
+        summary_report_blob_name, summary_container_name = await asyncio.to_thread(
+            produce_summary_report,
+            ocr_result_json.get("result", _EMPTY_DICT).get("contents", _EMPTY_LIST),
+            storage_account_name,
+            ocr_result_blob_name,
+        )
 
         # return success to the caller
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "success": True,
                 "message": "Summary File blob created successfully",
                 "summary_report_blob_name": summary_report_blob_name,
@@ -797,137 +1113,123 @@ def parse_ocr(req: func.HttpRequest) -> func.HttpResponse:
     except Exception as e:
         logging.error(f"Error in create_summary: {str(e)}")
         return func.HttpResponse(
-            json.dumps({
+            orjson.dumps({
                 "success": False,
                 "error": str(e),
                 "storage_account_name": storage_account_name,
-                "summary_report_blob_name": summary_report_blob_name
+                "summary_report_blob_name": summary_report_blob_name or "unknown"
             }),
             status_code=500,
             mimetype="application/json"
         )
-def produce_summary_report(ocr_result_json, storage_account_name, ocr_blob_name, credential):   
+# Fixed lines of the summary report, encoded once
+_SUMMARY_RULE = ("-" * 80).encode('utf-8')
+_SUMMARY_TITLE = "\n".join(["📊 DOCUMENT BUNDLE SUMMARY", "=" * 50]).encode('utf-8')
+_SUMMARY_TABLE_HEADER = "\n".join([
+    "\n📋 Document Summary:",
+    "-" * 80,
+    f"{'#':<3} {'Document Type':<50} {'Pages':<8} {'Fields':<8}",
+    "-" * 80,
+]).encode('utf-8')
+_SUMMARY_FIELD_DISTRIBUTION = "\n".join([
+    "\n📝 Field Distribution:",
+    "   • Insurance Claim Form: Patient information fields",
+    "   • Billing Statements: Expense details + document titles",
+    "   • Other Documents: Document titles only",
+]).encode('utf-8')
+
+def produce_summary_report(ocr_contents, storage_account_name, ocr_blob_name):
     """
     Display a concise summary of the document analysis results.
+    ocr_contents is the result.contents list of the OCR result, or any iterable
+    of its documents: it is walked once, and the document count and the bundle's
+    last page are collected on the way for the header.
+    Returns the summary report blob name and container name as a tuple
     """
+    # the summary-reports container and the report name (the ocr blob name with a .txt extension)
+    # are known up front, so the error path below can always log them
+    summary_container_name = "summary-reports"
+    summary_report_blob_name = ocr_blob_name.rsplit('.', 1)[0] + ".txt"
+
     try:
-        data = ocr_result_json
         # all of the print statement need to write to a variable that will be the report content
-        report_content = []
-        report_content.append("📊 DOCUMENT BUNDLE SUMMARY")
-        report_content.append("=" * 50)
-
-        result_data = data.get("result", {})
-        ocr_contents = result_data.get("contents", [])
-        if ocr_contents:  
-            last_end_page = ocr_contents[-1].get('endPageNumber', '?')  
-        else:  
-            last_end_page = '?'
-
-        report_content.append(f"Total documents found: {len(ocr_contents)}")
-        report_content.append(f"Total pages in bundle: {last_end_page}")
-
-        # Summary table
-        report_content.append("\n📋 Document Summary:")
-        report_content.append("-" * 80)
-        report_content.append(f"{'#':<3} {'Document Type':<50} {'Pages':<8} {'Fields':<8}")
-        report_content.append("-" * 80)
-        
+        # the table rows are collected first, the header lines are put in front after the pass
+        table_rows = []
+        total_documents = 0
+        last_end_page = '?'
         total_expenses = 0
+        # bind the lookups and the row template once, outside the per-document loop
+        get = dict.get
+        row_fmt = "{:<3} {:<50} {:<8} {:<8}".format
+        append_row = table_rows.append
         for i, content in enumerate(ocr_contents, 1):
-            category = content.get('category', 'Unknown')
-            start_page = content.get('startPageNumber', '?')
-            end_page = content.get('endPageNumber', '?')
+            start_page = get(content, 'startPageNumber', '?')
+            end_page = get(content, 'endPageNumber', '?')
+            total_documents = i
+            last_end_page = end_page
             
-            if start_page != '?' and end_page != '?':
-                page_range = f"{start_page}-{end_page}"
-                num_pages = end_page - start_page + 1
-            else:
-                page_range = '?'
-                num_pages = '?'
+            page_range = f"{start_page}-{end_page}" if start_page != '?' and end_page != '?' else '?'
             
-            fields = content.get('fields', {})
-            field_count = len(fields)
+            fields = get(content, 'fields', _EMPTY_DICT)
             
             # Count expenses
-            if 'Expenses' in fields:
-                expenses = fields['Expenses'].get('valueArray', [])
-                expense_count = len(expenses)
+            expenses_field = get(fields, 'Expenses')
+            if expenses_field is not None:
+                expense_count = len(get(expenses_field, 'valueArray', _EMPTY_LIST))
                 total_expenses += expense_count
-                field_info = f"{field_count} (+{expense_count} expenses)"
+                field_info = f"{len(fields)} (+{expense_count} expenses)"
             else:
-                field_info = str(field_count)
+                field_info = str(len(fields))
 
-            report_content.append(f"{i:<3} {category:<50} {page_range:<8} {field_info:<8}")
+            append_row(row_fmt(i, get(content, 'category', 'Unknown'), page_range, field_info).encode('utf-8'))
 
-        report_content.append("-" * 80)
-        report_content.append(f"\n💰 Total expenses found across all documents: {total_expenses}")
+        # the report is built as UTF-8 bytes: fixed lines are encoded once at import, the rest as they are made
+        report_content = [
+            _SUMMARY_TITLE,
+            f"Total documents found: {total_documents}".encode('utf-8'),
+            f"Total pages in bundle: {last_end_page}".encode('utf-8'),
+            _SUMMARY_TABLE_HEADER,
+        ]
+        report_content += table_rows
+        report_content.append(_SUMMARY_RULE)
+        report_content.append(f"\n💰 Total expenses found across all documents: {total_expenses}".encode('utf-8'))
 
         # Show which documents have patient info vs expenses
-        report_content.append(f"\n📝 Field Distribution:")
-        report_content.append(f"   • Insurance Claim Form: Patient information fields")
-        report_content.append(f"   • Billing Statements: Expense details + document titles")
-        report_content.append(f"   • Other Documents: Document titles only")
-
-        # Join all report content into a single string
-        # return "\n".join(report_content)
+        report_content.append(_SUMMARY_FIELD_DISTRIBUTION)
 
-    except NameError:
-        print("❌ Error: enhanced_result variable not found. Run the document processing cell first.")
-        return None
-
-    try:
         # ***************************************************
-        # We are uploading the excel to blob storage
+        # We are uploading the summary report to blob storage
         # ***************************************************
-        # we want to upload to the summary-reports container
-        summary_container_name = "summary-reports"
-
-        # Generate summary report file name from the ocr blob file name
-        # just change the extension to txt
-        summary_report_blob_name = ocr_blob_name.rsplit('.', 1)[0] + ".txt"
-
         # same storage account url as before
         storage_account_url = f"https://{storage_account_name}.blob.core.windows.net"
 
-        # The summary report blob url includes the summary_report_blob_name
-        summary_report_blob_url = storage_account_url + "/" + summary_container_name + "/" + summary_report_blob_name
-        summary_report_blob_service_client = BlobServiceClient(account_url=storage_account_url, credential=credential)
-        # use the blob service client to get a blob client
-        summary_report_blob_client = summary_report_blob_service_client.get_blob_client(container=summary_container_name, blob=summary_report_blob_name)
+        # use the shared container client to get a blob client
+        summary_report_blob_client = _get_container_client(storage_account_url, summary_container_name).get_blob_client(summary_report_blob_name)
 
         # ***************************************************
         # Upload the txt report content file to the summary
         # report container blob storage
         # ***************************************************
-        # combine rows
-        report_content = "\n".join(report_content)
-
-        #upload as a string
-        summary_report_blob_client.upload_blob(report_content, overwrite=True)
+        # combine the encoded rows; with the length known the SDK sends it in a single put
+        report_content = b"\n".join(report_content)
+        summary_report_blob_client.upload_blob(
+            report_content,
+            overwrite=True,
+            length=len(report_content),
+            content_settings=ContentSettings(content_type="text/plain; charset=utf-8"),
+        )
 
         # log it
         logging.info(f"Blob '{summary_report_blob_name}' uploaded successfully to summary container '{summary_container_name}'.")
 
         # return the summary report blob name and container name
-        return {
-            "summary_report_blob_name": summary_report_blob_name,
-            "summary_container_name": summary_container_name
-        }
+        return summary_report_blob_name, summary_container_name
     except Exception as e:
         logging.info(f"❌ Error creating summary report: {e}")
-        logging.info(f" The connection string was {storage_account_url}")
         logging.info(f" The storage_account_name was {storage_account_name}")
         logging.info(f" The target summary container_name was {summary_container_name}")
         logging.info(f" The blob name was {summary_report_blob_name}")
 
-        # if there was an error, return what we know
-        if summary_report_blob_name is None:
-            summary_report_blob_name = "unknown_due_to_error"
-        if summary_container_name is None:
-            summary_container_name = "unknown_due_to_error"
-        return {
-            "summary_report_blob_name": summary_report_blob_name,
-            "summary_container_name": summary_container_name
-        }
+        # if there was an error, return the same shape with placeholders
+        return "unknown_due_to_error", "unknown_due_to_error"
     #test with curl -G "https://fat-1488137190.azurewebsites.net/api/parse_ocr" --data-urlencode "ocr_result_blob_name=sample claim submission.pdf_20251016_111305.json"  --data-urlencode "storage_account_name=wwawilkdemostow"
\ No newline at end of file